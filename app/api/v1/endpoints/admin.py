@@ -0,0 +1,77 @@
+"""
+Admin Endpoints
+
+All endpoints: Requires authentication with role_level >= PROFILER_MIN_ROLE_LEVEL
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from atams.logging import get_logger
+
+from app.core.config import settings
+from app.core.profiler import ProfilerBusy, profiler
+from app.api.deps import require_auth, require_min_role_level
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_min_role_level(settings.PROFILER_MIN_ROLE_LEVEL))]
+)
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS, description="Sampling duration"),
+    interval_ms: float = Query(
+        10, ge=settings.PROFILER_MIN_INTERVAL_MS, le=1000, description="Sampling interval"
+    ),
+    app_only: bool = Query(True, description="Only keep stacks passing through app code"),
+    current_user: dict = Depends(require_auth)
+):
+    """
+    Profile the worker serving this request
+
+    Samples all threads of this worker for `seconds` and returns collapsed stacks
+    (`frame;frame;frame count` per line) for flamegraph.pl / speedscope. With several
+    workers, each call profiles whichever worker received it.
+
+    **Authorization:** Required (role_level >= PROFILER_MIN_ROLE_LEVEL)
+
+    **Response:**
+    - Collapsed stacks as text/plain, heaviest first
+    - X-Profile-* headers with sample count, duration, final interval and overhead
+    - Status code 200
+    - Raises 404 if the profiler is disabled
+    - Raises 409 if a session is already running on this worker
+    - Raises 403 if insufficient permission
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiler is disabled"
+        )
+
+    logger.info(
+        f"Profiling started by {current_user.get('username', 'unknown')} for {seconds}s",
+        extra={'extra_data': {'seconds': seconds, 'interval_ms': interval_ms, 'app_only': app_only}}
+    )
+    try:
+        result = await run_in_threadpool(profiler.run, seconds, interval_ms, app_only)
+    except ProfilerBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    return PlainTextResponse(
+        result.collapsed(),
+        headers={
+            "X-Profile-Samples": str(result.samples),
+            "X-Profile-Duration": f"{result.duration:.3f}s",
+            "X-Profile-Interval": f"{result.interval * 1000:.1f}ms",
+            "X-Profile-Overhead": f"{result.overhead:.4f}",
+        }
+    )
@@ -2,28 +2,104 @@
 Compro Assets Endpoints
 
 GET endpoints: No authentication required (public)
-POST/PUT/DELETE endpoints: Requires authentication with role_level >= 10
+POST/PUT/PATCH/DELETE endpoints: Requires authentication with role_level >= 10
 """
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from app.core.admission import run_db
+from app.core.config import settings
+from app.core.serialization import render
+from app.core.single_flight import cached_read, cached_read_many
 from app.db.session import get_db
 from app.services.compro_asset_service import ComproAssetService
-from app.schemas.compro_asset import ComproAsset, ComproAssetCreate, ComproAssetUpdate, ComproAssetList
+from app.schemas.compro_asset import (
+    ComproAsset, ComproAssetBatchItem, ComproAssetCreate, ComproAssetUpdate, ComproAssetList
+)
 from app.schemas.common import DataResponse
 from app.api.deps import require_auth, require_min_role_level
 
 router = APIRouter()
 service = ComproAssetService()
 
+AssetListResponse = DataResponse[List[ComproAssetList]]
+AssetResponse = DataResponse[ComproAsset]
+AssetBatchResponse = DataResponse[List[ComproAssetBatchItem]]
+
+MAX_ASSET_ID = 2 ** 63 - 1  # ca_id is BIGINT
+
+
+def parse_ids(values: List[str]) -> List[int]:
+    """
+    Parse repeated and/or comma-separated IDs (?ids=1&ids=2 or ?ids=1,2)
+    Raises 400 before any DB or cache work if the list is empty, too long, or holds
+    values outside the BIGINT ID range
+    """
+    try:
+        ca_ids = [int(part) for value in values for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Asset IDs must be integers"
+        )
+
+    if not ca_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one asset ID is required"
+        )
+    if len(ca_ids) > settings.ASSET_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {settings.ASSET_BATCH_MAX_IDS} asset IDs per request"
+        )
+    if any(ca_id < 1 or ca_id > MAX_ASSET_ID for ca_id in ca_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Asset IDs must be between 1 and {MAX_ASSET_ID}"
+        )
+    return ca_ids
+
+
+def parse_if_match(value: Optional[str]) -> Optional[List[int]]:
+    """
+    Parse an If-Match header into accepted row versions
+    Returns None when the header is absent or "*" (no version check)
+
+    If-Match uses strong comparison (RFC 9110 section 13.1.1): weak tags (W/"...")
+    and malformed tags never match, so a header with only those fails with 412.
+    """
+    if value is None or value.strip() == "*":
+        return None
+    versions = []
+    for tag in value.split(","):
+        tag = tag.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
+
+
+def wants_fresh(cache_control: Optional[str]) -> bool:
+    """True if the request asks to bypass cached copies (Cache-Control: no-cache)"""
+    if not cache_control:
+        return False
+    return any(part.strip().lower() == "no-cache" for part in cache_control.split(","))
+
+
+def with_etag(response: Response, asset: ComproAsset) -> Response:
+    """Expose the row version as ETag for use in If-Match"""
+    response.headers["ETag"] = f'"{asset.ca_version}"'
+    return response
+
 
 @router.get(
     "/",
-    response_model=DataResponse[List[ComproAssetList]],
+    response_model=AssetListResponse,
     status_code=status.HTTP_200_OK
 )
-async def get_assets(db: Session = Depends(get_db)):
+async def get_assets():
     """
     Get all assets (public endpoint)
 
@@ -33,41 +109,83 @@ async def get_assets(db: Session = Depends(get_db)):
     - Returns list of assets with simplified fields
     - Status code 200
     """
-    assets = service.get_all_assets(db)
-    return DataResponse(
+    assets = await cached_read(("assets",), service.get_all_assets)
+    payload = AssetListResponse.model_construct(
         success=True,
         message="Assets retrieved successfully",
         data=assets
     )
+    return render(AssetListResponse, payload)
+
+
+@router.get(
+    "/batch",
+    response_model=AssetBatchResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_assets_batch(
+    ids: List[str] = Query(..., description="Asset IDs, repeated or comma-separated")
+):
+    """
+    Get many assets by ID in one request (public endpoint)
+
+    **Authorization:** None (public)
+
+    **Response:**
+    - Returns one item per requested ID, in request order
+    - Each item has `found` and the full asset detail in `data` (null when not found)
+    - Cached assets are shared with GET /assets/{ca_id}; only uncached IDs hit the database
+    - Status code 200
+    - Raises 400 if IDs are invalid or exceed the batch limit
+    """
+    ca_ids = parse_ids(ids)
+    found = await cached_read_many("asset", ca_ids, service.get_assets_by_ids)
+    payload = AssetBatchResponse.model_construct(
+        success=True,
+        message="Assets retrieved successfully",
+        data=[
+            ComproAssetBatchItem(ca_id=ca_id, found=ca_id in found, data=found.get(ca_id))
+            for ca_id in ca_ids
+        ]
+    )
+    return render(AssetBatchResponse, payload)
 
 
 @router.get(
     "/{ca_id}",
-    response_model=DataResponse[ComproAsset],
+    response_model=AssetResponse,
     status_code=status.HTTP_200_OK
 )
-async def get_asset(ca_id: int, db: Session = Depends(get_db)):
+async def get_asset(
+    ca_id: int,
+    cache_control: Optional[str] = Header(None, alias="Cache-Control")
+):
     """
     Get asset by ID (public endpoint)
 
+    Send `Cache-Control: no-cache` to skip the per-worker cache (see README, "Partially Update Asset").
+
     **Authorization:** None (public)
 
     **Response:**
-    - Returns full asset details
+    - Returns full asset details with ETag header
     - Status code 200
     - Raises 404 if not found
     """
-    asset = service.get_asset_by_id(db, ca_id)
-    return DataResponse(
+    asset = await cached_read(
+        ("asset", ca_id), service.get_asset_by_id, ca_id, fresh=wants_fresh(cache_control)
+    )
+    payload = AssetResponse.model_construct(
         success=True,
         message="Asset retrieved successfully",
         data=asset
     )
+    return with_etag(render(AssetResponse, payload), asset)
 
 
 @router.post(
     "/",
-    response_model=DataResponse[ComproAsset],
+    response_model=AssetResponse,
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_min_role_level(10))]
 )
@@ -86,43 +204,92 @@ async def create_asset(
     - Status code 201
     - Raises 403 if insufficient permission
     """
-    new_asset = service.create_asset(db, asset, current_user)
-    return DataResponse(
+    new_asset = await run_db(service.create_asset, db, asset, current_user)
+    payload = AssetResponse.model_construct(
         success=True,
         message="Asset created successfully",
         data=new_asset
     )
+    return render(AssetResponse, payload, status.HTTP_201_CREATED)
 
 
 @router.put(
     "/{ca_id}",
-    response_model=DataResponse[ComproAsset],
+    response_model=AssetResponse,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_min_role_level(10))]
 )
 async def update_asset(
     ca_id: int,
     asset: ComproAssetUpdate,
+    if_match: Optional[str] = Header(None, alias="If-Match"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_auth)
 ):
     """
     Update existing asset
 
+    Honors `If-Match` with a previous ETag (see README, "Partially Update Asset").
+
     **Authorization:** Required (role_level >= 10)
 
     **Response:**
-    - Returns updated asset
+    - Returns updated asset with ETag header
     - Status code 200
     - Raises 404 if not found
+    - Raises 412 if If-Match does not match the current version
+    - Raises 409 if the asset changed concurrently
     - Raises 403 if insufficient permission
     """
-    updated_asset = service.update_asset(db, ca_id, asset, current_user)
-    return DataResponse(
+    updated_asset = await run_db(
+        service.update_asset, db, ca_id, asset, current_user, parse_if_match(if_match)
+    )
+    payload = AssetResponse.model_construct(
         success=True,
         message="Asset updated successfully",
         data=updated_asset
     )
+    return with_etag(render(AssetResponse, payload), updated_asset)
+
+
+@router.patch(
+    "/{ca_id}",
+    response_model=AssetResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_min_role_level(10))]
+)
+async def patch_asset(
+    ca_id: int,
+    asset: ComproAssetUpdate,
+    if_match: Optional[str] = Header(None, alias="If-Match"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_auth)
+):
+    """
+    Partially update existing asset
+
+    Only fields present in the body are applied; unchanged values are not written.
+    Honors `If-Match` with a previous ETag (see README, "Partially Update Asset").
+
+    **Authorization:** Required (role_level >= 10)
+
+    **Response:**
+    - Returns updated asset with ETag header
+    - Status code 200
+    - Raises 404 if not found
+    - Raises 412 if If-Match does not match the current version
+    - Raises 409 if the asset changed concurrently
+    - Raises 403 if insufficient permission
+    """
+    patched_asset = await run_db(
+        service.patch_asset, db, ca_id, asset, current_user, parse_if_match(if_match)
+    )
+    payload = AssetResponse.model_construct(
+        success=True,
+        message="Asset updated successfully",
+        data=patched_asset
+    )
+    return with_etag(render(AssetResponse, payload), patched_asset)
 
 
 @router.delete(
@@ -147,7 +314,7 @@ async def delete_asset(
     - Raises 404 if not found
     - Raises 403 if insufficient permission
     """
-    service.delete_asset(db, ca_id)
+    await run_db(service.delete_asset, db, ca_id)
     return DataResponse(
         success=True,
         message="Asset deleted successfully",
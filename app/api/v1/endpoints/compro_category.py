@@ -3,25 +3,31 @@ Compro Category Endpoints
 
 GET endpoints: No authentication required (public)
 """
-from typing import List
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Query, status
 
-from app.db.session import get_db
+from app.core.serialization import render
+from app.core.single_flight import cached_read
 from app.services.compro_category_service import ComproCategoryService
-from app.schemas.compro_category import ComproCategory
+from app.schemas.compro_category import ComproCategory, ComproCategoryWithAssets
 from app.schemas.common import DataResponse
 
 router = APIRouter()
 service = ComproCategoryService()
 
+CategoryListResponse = DataResponse[List[ComproCategory]]
+CategoryWithAssetsListResponse = DataResponse[List[ComproCategoryWithAssets]]
+
 
 @router.get(
     "/",
-    response_model=DataResponse[List[ComproCategory]],
+    response_model=Union[CategoryWithAssetsListResponse, CategoryListResponse],
     status_code=status.HTTP_200_OK
 )
-async def get_categories(db: Session = Depends(get_db)):
+async def get_categories(
+    include: Optional[Literal["assets"]] = Query(None, description="Set to `assets` to embed assets"),
+    per_category: int = Query(5, ge=1, le=50, description="Assets per category when include=assets")
+):
     """
     Get all categories (public endpoint)
 
@@ -29,12 +35,26 @@ async def get_categories(db: Session = Depends(get_db)):
 
     **Response:**
     - Returns list of categories with cc_id and cc_name
+    - With `include=assets`: also asset_count and the first `per_category` assets
+      (ComproAssetList shape) per category, loaded in a single query
     - Ordered by category name
     - Status code 200
     """
-    categories = service.get_all_categories(db)
-    return DataResponse(
+    if include == "assets":
+        categories_with_assets = await cached_read(
+            ("categories_with_assets", per_category), service.get_all_categories_with_assets, per_category
+        )
+        payload = CategoryWithAssetsListResponse.model_construct(
+            success=True,
+            message="Categories retrieved successfully",
+            data=categories_with_assets
+        )
+        return render(CategoryWithAssetsListResponse, payload)
+
+    categories = await cached_read(("categories",), service.get_all_categories)
+    payload = CategoryListResponse.model_construct(
         success=True,
         message="Categories retrieved successfully",
         data=categories
     )
+    return render(CategoryListResponse, payload)
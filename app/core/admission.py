@@ -0,0 +1,143 @@
+"""
+DB Admission Control
+
+Bounds how many requests per worker use the database at once. Up to DB_CONCURRENCY_LIMIT
+requests run; up to DB_QUEUE_SIZE more wait at most DB_QUEUE_TIMEOUT seconds for a slot.
+Anything beyond that is shed immediately with 503 + Retry-After instead of piling up
+on pool checkout until clients time out.
+
+Usage:
+    new_asset = await run_db(service.create_asset, db, asset, current_user)
+
+Public reads go through cached_read() (app/core/single_flight.py), which uses
+run_admitted() and can answer shed requests from stale cache entries.
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, TypeVar
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot get a DB slot (queue full or wait deadline passed)"""
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded FIFO wait queue
+
+    Runs on the worker's event loop only (no locks). A released slot is handed directly
+    to the oldest waiter, so waiters are served in arrival order.
+    """
+
+    def __init__(self, limit: int, max_queue: int, timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.stale_served = 0
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if needed; raises Overloaded"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            raise Overloaded("DB wait queue is full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up: pass it on
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise Overloaded("Timed out waiting for a DB slot")
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Give the slot to the oldest live waiter, or free it"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+            "stale_served": self.stale_served,
+        }
+
+
+db_admission = AdmissionController(
+    limit=settings.DB_CONCURRENCY_LIMIT,
+    max_queue=settings.DB_QUEUE_SIZE,
+    timeout=settings.DB_QUEUE_TIMEOUT,
+)
+
+
+def service_unavailable() -> HTTPException:
+    """503 telling the client when to retry"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Service is busy, please retry shortly",
+        headers={"Retry-After": str(settings.DB_SHED_RETRY_AFTER)}
+    )
+
+
+async def run_admitted(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a blocking DB-backed service call in the threadpool under admission control
+    Raises Overloaded when the request is shed
+    """
+    if not settings.DB_ADMISSION_ENABLED:
+        return await run_in_threadpool(func, *args)
+    async with db_admission.slot():
+        return await run_in_threadpool(func, *args)
+
+
+async def run_db(func: Callable[..., T], *args: Any) -> T:
+    """Like run_admitted, but sheds with 503 + Retry-After"""
+    try:
+        return await run_admitted(func, *args)
+    except Overloaded:
+        raise service_unavailable()
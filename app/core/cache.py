@@ -0,0 +1,126 @@
+"""
+Content Cache
+
+Per-worker, bounded TTL cache for public read responses.
+
+Entries are tagged with the content version current when they were stored. Any write
+calls bump(), which makes every older entry a miss in O(1) without walking the cache.
+Writes made by other workers are not seen until CACHE_TTL expires, so keep the TTL short.
+
+Expired or outdated entries are kept for CACHE_STALE_TTL more seconds (LRU permitting)
+so get_stale() can answer requests shed under DB overload.
+
+Usage:
+    cached = content_cache.get(("asset", ca_id))
+    if cached is None:
+        cached = load()
+        content_cache.set(("asset", ca_id), cached)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from app.core.config import settings
+
+
+class _Entry:
+    __slots__ = ("version", "expires_at", "value")
+
+    def __init__(self, version: int, expires_at: float, value: Any):
+        self.version = version
+        self.expires_at = expires_at
+        self.value = value
+
+
+class ContentCache:
+    """
+    LRU cache with TTL and version-based invalidation
+
+    Thread-safe: services run in the threadpool as well as on the event loop.
+    None values are never cached (None means miss).
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 30, stale_ttl: float = 0, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the fresh value for key, or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != self.version or entry.expires_at < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return the value for key even if expired or outdated, within stale_ttl"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at + self.stale_ttl < time.monotonic():
+                return None
+            return entry.value
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Return fresh values for the keys that are cached"""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        """
+        Store value under the current content version
+
+        Pass the version read before loading value so a concurrent write is not masked.
+        """
+        if not self.enabled or value is None:
+            return
+        with self._lock:
+            if version is None:
+                version = self.version
+            current = self._entries.get(key)
+            if current is not None and current.version > version:
+                # A read that started before a write finished after a newer read
+                return
+            self._entries[key] = _Entry(version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self) -> None:
+        """Invalidate all cached content after a write"""
+        with self._lock:
+            self.version += 1
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+content_cache = ContentCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL,
+    stale_ttl=settings.CACHE_STALE_TTL,
+    enabled=settings.CACHE_ENABLED,
+)
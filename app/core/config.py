@@ -1,3 +1,4 @@
+from typing import Optional
 from atams import AtamsBaseSettings
 
 
@@ -19,5 +20,44 @@ class Settings(AtamsBaseSettings):
     APP_NAME: str = "compro_assets"
     APP_VERSION: str = "1.0.0"
 
+    # Rate Limiting (RATE_LIMIT_REQUESTS applies to reads, writes use the stricter limit)
+    RATE_LIMIT_WRITE_REQUESTS: int = 20
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    RATE_LIMIT_MAX_KEYS: int = 10000  # Max tracked clients per worker (memory backend)
+    RATE_LIMIT_TRUSTED_PROXIES: int = 0  # Reverse proxies in front of the app that append X-Forwarded-For
+
+    # Response serialization (see app/core/serialization.py)
+    TRUSTED_SERIALIZATION: bool = True  # Skip re-validating responses built from our own rows
+    TRUSTED_SERIALIZATION_CHECK: bool = False  # Debug: compare against the validating path on every response
+
+    # Content cache for public reads (per worker, see app/core/cache.py)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL: int = 30  # Seconds; also bounds staleness of writes made by other workers
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_STALE_TTL: int = 300  # Seconds past expiry an entry may still be served when the DB is overloaded
+
+    # DB admission control (per worker, see app/core/admission.py)
+    DB_ADMISSION_ENABLED: bool = True
+    DB_CONCURRENCY_LIMIT: int = 10  # Keep <= engine pool_size + max_overflow
+    DB_QUEUE_SIZE: int = 50  # Requests allowed to wait for a slot; beyond this they get 503
+    DB_QUEUE_TIMEOUT: float = 2.0  # Seconds a queued request waits before 503
+    DB_SHED_RETRY_AFTER: int = 1  # Retry-After seconds on 503
+    DB_STALE_FALLBACK: bool = True  # Serve stale cached public GETs instead of 503
+
+    # GET /metrics exposes internal counters, so it requires an SSO role
+    METRICS_MIN_ROLE_LEVEL: int = 50
+
+    # On-demand sampling profiler (GET /api/v1/admin/profile, see app/core/profiler.py)
+    PROFILER_ENABLED: bool = True
+    PROFILER_MIN_ROLE_LEVEL: int = 50
+    PROFILER_MAX_SECONDS: int = 30
+    PROFILER_MIN_INTERVAL_MS: float = 5.0
+    PROFILER_MAX_OVERHEAD: float = 0.02  # Max fraction of wall time spent sampling
+    PROFILER_MAX_DEPTH: int = 128
+
+    # Batch lookup
+    ASSET_BATCH_MAX_IDS: int = 100
+
 
 settings = Settings()
@@ -0,0 +1,150 @@
+"""
+Sampling Profiler
+
+Low-overhead wall-clock sampler for live workers. A background thread periodically
+reads every thread's current stack (sys._current_frames) and counts identical stacks.
+The result is in collapsed-stack format ("frame;frame;frame count" per line), which
+flamegraph.pl, speedscope and most flame graph viewers accept.
+
+Safety limits:
+- one session per worker at a time
+- duration capped at PROFILER_MAX_SECONDS
+- interval never below PROFILER_MIN_INTERVAL_MS, and stretched automatically if
+  sampling would cost more than PROFILER_MAX_OVERHEAD of wall time
+- stack depth capped at PROFILER_MAX_DEPTH frames (deeper stacks get a "[truncated]" root)
+
+Usage:
+    result = profiler.run(seconds=10, interval_ms=10)
+    body = result.collapsed()
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+APP_PACKAGE = "app."
+TRUNCATED = "[truncated]"
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profiling session is already running on this worker"""
+
+
+class ProfileResult:
+    """Aggregated samples from one session"""
+
+    def __init__(self, stacks: Counter, samples: int, duration: float, interval: float, overhead: float):
+        self.stacks = stacks
+        self.samples = samples
+        self.duration = duration
+        self.interval = interval
+        self.overhead = overhead
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, heaviest first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class SamplingProfiler:
+    """Samples all threads except its own; see module docstring for limits"""
+
+    def __init__(self, max_seconds: float, min_interval_ms: float, max_overhead: float, max_depth: int):
+        self.max_seconds = max_seconds
+        self.min_interval = min_interval_ms / 1000
+        self.max_overhead = max_overhead
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._labels: Dict[object, str] = {}
+
+    def run(self, seconds: float, interval_ms: float, app_only: bool = True) -> ProfileResult:
+        """
+        Sample for `seconds` (blocking; call from a worker thread)
+
+        Args:
+            seconds: Duration, capped at max_seconds
+            interval_ms: Target sampling interval, floored at min_interval
+            app_only: Keep only stacks that pass through our `app.` package
+                      (request, service, repository and serialization code)
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A profiling session is already running on this worker")
+        try:
+            return self._sample(min(seconds, self.max_seconds), max(interval_ms / 1000, self.min_interval), app_only)
+        finally:
+            self._labels.clear()
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float, app_only: bool) -> ProfileResult:
+        own_ident = threading.get_ident()
+        thread_names = {}
+        stacks: Counter = Counter()
+        samples = 0
+        sampling_time = 0.0
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        while True:
+            tick = time.perf_counter()
+            if tick >= deadline:
+                break
+
+            frames = sys._current_frames()
+            if len(thread_names) != len(frames):
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                stack = self._collapse(frame, app_only)
+                if stack is not None:
+                    stacks[f"{thread_names.get(ident, 'thread')};{stack}"] += 1
+            del frames
+            samples += 1
+
+            cost = time.perf_counter() - tick
+            sampling_time += cost
+            # Keep cost / interval within the overhead budget
+            if cost > interval * self.max_overhead:
+                interval = cost / self.max_overhead
+            time.sleep(max(min(interval - cost, deadline - time.perf_counter()), 0))
+
+        duration = time.perf_counter() - started
+        return ProfileResult(
+            stacks=stacks,
+            samples=samples,
+            duration=duration,
+            interval=interval,
+            overhead=sampling_time / duration if duration else 0.0,
+        )
+
+    def _collapse(self, frame, app_only: bool) -> Optional[str]:
+        """Root-first "module:function" labels joined by ';', or None if filtered out"""
+        labels = []
+        in_app = not app_only
+        while frame is not None and len(labels) < self.max_depth:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = f"{frame.f_globals.get('__name__', '?')}:{code.co_name}"
+                self._labels[code] = label
+            if not in_app and label.startswith(APP_PACKAGE):
+                in_app = True
+            labels.append(label)
+            frame = frame.f_back
+        if not in_app:
+            return None
+        if frame is not None:
+            # Root frames were cut by max_depth; mark it so viewers don't show a false root
+            labels.append(TRUNCATED)
+        labels.reverse()
+        return ";".join(labels)
+
+
+profiler = SamplingProfiler(
+    max_seconds=settings.PROFILER_MAX_SECONDS,
+    min_interval_ms=settings.PROFILER_MIN_INTERVAL_MS,
+    max_overhead=settings.PROFILER_MAX_OVERHEAD,
+    max_depth=settings.PROFILER_MAX_DEPTH,
+)
@@ -0,0 +1,267 @@
+"""
+Rate Limiting
+
+Sliding-window-counter limiter keyed by client IP.
+
+Tokens are not validated here (that happens later, in require_auth), so they are not
+used as keys: a client could otherwise get a fresh bucket per request by sending random
+tokens, and flood the key table with them.
+
+Each key keeps two counters (current and previous fixed window); the estimate is
+    previous * (1 - elapsed / window) + current
+which approximates a true sliding window in O(1) time and constant memory per key.
+
+Backends:
+- memory: per-worker, bounded LRU of keys with idle-key eviction
+- redis:  shared across workers (requires the optional `redis` package)
+
+Write methods (POST/PUT/PATCH/DELETE) use RATE_LIMIT_WRITE_REQUESTS, reads use
+RATE_LIMIT_REQUESTS. Both share RATE_LIMIT_WINDOW.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from atams.logging import get_logger
+
+from app.core.config import settings
+
+logger = get_logger(__name__)
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+EXEMPT_PATHS = frozenset({"/", "/health", "/docs", "/redoc", "/openapi.json"})
+
+
+def retry_after_seconds(previous: int, current: int, elapsed: float, window: int, limit: int) -> int:
+    """
+    Seconds until the sliding-window estimate leaves room for one more request
+    """
+    if current < limit and previous > 0:
+        # Room appears once the previous window's weight decays enough
+        needed = 1 - (limit - current - 1) / previous
+        wait = needed * window - elapsed
+    else:
+        # Must roll into the next window, where the current count becomes "previous"
+        wait = window - elapsed
+        if current > 0:
+            wait += max(1 - (limit - 1) / current, 0) * window
+    return max(1, math.ceil(wait))
+
+
+class _Counter:
+    """Compact per-key state"""
+    __slots__ = ("window_index", "current", "previous", "last_seen")
+
+    def __init__(self, window_index: int, now: float):
+        self.window_index = window_index
+        self.current = 0
+        self.previous = 0
+        self.last_seen = now
+
+
+class MemoryBackend:
+    """
+    Per-worker sliding window counters
+
+    Keys live in an OrderedDict ordered by last access. Every hit evicts idle keys
+    (untouched for two windows) from the front, and the oldest keys once max_keys is
+    reached, so memory stays bounded even under scraping bursts.
+    """
+
+    def __init__(self, max_keys: int = 10000, clock: Callable[[], float] = time.time):
+        self.max_keys = max_keys
+        self.clock = clock
+        self.counters: "OrderedDict[str, _Counter]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int, int]:
+        """
+        Register a request for key
+
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        now = self.clock()
+        window_index = int(now // window)
+        elapsed = now - window_index * window
+
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = _Counter(window_index, now)
+            self.counters[key] = counter
+        else:
+            self.counters.move_to_end(key)
+            if counter.window_index != window_index:
+                # Slide: the last window becomes "previous", anything older is dropped
+                counter.previous = counter.current if counter.window_index == window_index - 1 else 0
+                counter.current = 0
+                counter.window_index = window_index
+            counter.last_seen = now
+
+        self._evict(now, window)
+
+        estimate = counter.previous * (1 - elapsed / window) + counter.current
+        if estimate + 1 > limit:
+            retry_after = retry_after_seconds(counter.previous, counter.current, elapsed, window, limit)
+            return False, 0, retry_after
+
+        counter.current += 1
+        return True, max(int(limit - estimate - 1), 0), 0
+
+    def _evict(self, now: float, window: int) -> None:
+        """Drop idle keys from the LRU front and enforce max_keys"""
+        idle_before = now - 2 * window
+        while self.counters:
+            oldest = next(iter(self.counters.values()))
+            if len(self.counters) <= self.max_keys and oldest.last_seen >= idle_before:
+                break
+            self.counters.popitem(last=False)
+
+
+class RedisBackend:
+    """
+    Shared sliding window counters stored in Redis
+
+    Each key/window pair is a plain counter with a TTL of two windows, so Redis
+    cleans up idle keys on its own. Fails open if Redis is unreachable.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requires the 'redis' package (pip install redis)"
+            ) from e
+
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int, int]:
+        """
+        Register a request for key
+
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        now = time.time()
+        window_index = int(now // window)
+        elapsed = now - window_index * window
+        current_key = f"{self.prefix}:{key}:{window_index}"
+        previous_key = f"{self.prefix}:{key}:{window_index - 1}"
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.incr(current_key)
+                pipe.expire(current_key, window * 2)
+                pipe.get(previous_key)
+                current, _, previous = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Rate limit backend unavailable, allowing request: {str(e)}")
+            return True, limit, 0
+
+        # INCR already counted this request; compare using the count before it
+        current = int(current) - 1
+        previous = int(previous or 0)
+        estimate = previous * (1 - elapsed / window) + current
+        if estimate + 1 > limit:
+            # Rejected requests do not consume quota
+            try:
+                await self.client.decr(current_key)
+            except Exception:
+                pass
+            return False, 0, retry_after_seconds(previous, current, elapsed, window, limit)
+
+        return True, max(int(limit - estimate - 1), 0), 0
+
+
+def create_backend():
+    """Create the rate limit backend configured in settings"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires RATE_LIMIT_REDIS_URL")
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL, prefix=f"{settings.APP_NAME}:ratelimit")
+    return MemoryBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+def get_client_key(request: Request) -> str:
+    """
+    Identify the caller by IP
+
+    Behind RATE_LIMIT_TRUSTED_PROXIES reverse proxies, the client is the X-Forwarded-For
+    entry appended by the outermost trusted proxy (counted from the right). Entries to
+    its left are client-supplied and ignored.
+    """
+    hops = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if hops > 0:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",")]
+        if len(forwarded) >= hops and forwarded[-hops]:
+            return "ip:" + forwarded[-hops]
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Enforce per-client rate limits
+
+    - Separate buckets for reads and writes (writes are stricter)
+    - Adds X-RateLimit-* headers to responses
+    - Returns 429 with Retry-After when the limit is exceeded
+    """
+
+    def __init__(self, app, backend=None):
+        super().__init__(app)
+        self.backend = backend or create_backend()
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if not settings.RATE_LIMIT_ENABLED or request.url.path in EXEMPT_PATHS:
+            return await call_next(request)
+
+        if request.method in WRITE_METHODS:
+            bucket, limit = "w", settings.RATE_LIMIT_WRITE_REQUESTS
+        else:
+            bucket, limit = "r", settings.RATE_LIMIT_REQUESTS
+        window = settings.RATE_LIMIT_WINDOW
+        client_key = get_client_key(request)
+
+        is_allowed, remaining, retry_after = await self.backend.hit(f"{bucket}:{client_key}", limit, window)
+
+        if not is_allowed:
+            logger.warning(
+                f"Rate limit exceeded for {client_key}",
+                extra={
+                    'extra_data': {
+                        'client_key': client_key,
+                        'path': request.url.path,
+                        'method': request.method
+                    }
+                }
+            )
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "success": False,
+                    "message": "Rate limit exceeded",
+                    "details": {
+                        "limit": limit,
+                        "window": f"{window}s",
+                        "retry_after": retry_after
+                    }
+                },
+                headers={
+                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Window": f"{window}s",
+                }
+            )
+
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(limit)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Window"] = f"{window}s"
+        return response
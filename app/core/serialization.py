@@ -0,0 +1,79 @@
+"""
+Response Serialization
+
+Fast path for responses built from rows of our own database.
+
+Returning a pydantic model from an endpoint makes FastAPI dump it, validate it again
+against `response_model` and dump it once more. Services already validate each row
+exactly once when building the response schemas, so render() skips that second pass
+and writes JSON straight from the model. `response_model` stays on the route for OpenAPI.
+
+Note: the rows themselves are still validated, not built with model_construct. Per
+scripts/benchmark_serialization.py, validation is much faster for the list responses
+(GET /assets, GET /assets/batch, GET /categories with or without include=assets). For single-asset responses (GET /assets/{ca_id}, POST/PUT)
+the two are within a few microseconds, and which one wins varies by machine. Validating
+everywhere keeps one code path and guarantees rows match the schema.
+
+With TRUSTED_SERIALIZATION_CHECK=true every response is also rendered through the
+validating path and the bytes are compared; any difference raises an AssertionError.
+"""
+import json
+from functools import lru_cache
+from typing import Any
+
+from fastapi import status
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def get_adapter(response_model: Any) -> TypeAdapter:
+    """Cached TypeAdapter per response model (building one compiles a validator)"""
+    return TypeAdapter(response_model)
+
+
+def render_validated(response_model: Any, payload: BaseModel) -> bytes:
+    """
+    Serialize the way a validating response_model does
+
+    Dumps the payload, validates it against response_model, dumps it again in JSON mode
+    and encodes it like JSONResponse.
+    """
+    adapter = get_adapter(response_model)
+    value = adapter.validate_python(payload.model_dump(by_alias=True))
+    content = adapter.dump_python(value, mode="json", by_alias=True)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_trusted(payload: BaseModel) -> bytes:
+    """Serialize an already validated payload directly"""
+    return payload.model_dump_json(by_alias=True).encode("utf-8")
+
+
+def render(response_model: Any, payload: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Build the JSON response for a trusted payload
+
+    Usage:
+        payload = DataResponse[ComproAsset].model_construct(success=True, message="...", data=asset)
+        return render(DataResponse[ComproAsset], payload)
+    """
+    if not settings.TRUSTED_SERIALIZATION:
+        body = render_validated(response_model, payload)
+    else:
+        body = render_trusted(payload)
+        if settings.TRUSTED_SERIALIZATION_CHECK:
+            expected = render_validated(response_model, payload)
+            if body != expected:
+                raise AssertionError(
+                    f"Trusted serialization mismatch for {response_model}: {body!r} != {expected!r}"
+                )
+    return Response(content=body, status_code=status_code, media_type="application/json")
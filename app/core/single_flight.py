@@ -0,0 +1,146 @@
+"""
+Single-Flight Reads
+
+Coalesces concurrent identical reads within a worker. The first request for a key
+runs the (blocking) service method in the threadpool, under DB admission control;
+requests arriving while it is in flight await the same result instead of issuing
+their own query.
+
+Usage:
+    assets = await cached_read(("assets",), service.get_all_assets)
+    found = await cached_read_many("asset", ca_ids, service.get_assets_by_ids)
+
+cached_read() also serves fresh hits from the content cache without leaving the event
+loop and stores results on the way out. The flight key includes the content version,
+so a request made after a write never joins a read that started before it. If the read
+is shed by admission control, a stale cache entry is served when DB_STALE_FALLBACK is on.
+
+The shared read opens and closes its own session: it outlives any single caller (a
+disconnected client must not close the session the others are waiting on).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, TypeVar
+
+from app.core.admission import Overloaded, db_admission, run_admitted, service_unavailable
+from app.core.cache import content_cache
+from app.core.config import settings
+from app.db.session import run_with_session
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Keyed in-flight deduplication for async callables
+
+    The shared computation runs in its own task, so a cancelled (disconnected) caller
+    does not cancel it for the others still waiting.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func once per key at a time; concurrent callers share its result"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "executed": self.executed,
+            "queries_saved": self.coalesced,
+        }
+
+
+read_flight = SingleFlight()
+
+
+async def cached_read(key: Hashable, func: Callable[..., T], *args: Any, fresh: bool = False) -> T:
+    """
+    Read through the content cache with single-flight on misses
+
+    Args:
+        key: Cache / flight key, e.g. ("asset", ca_id)
+        func: Blocking service read, called as func(db, *args) in the threadpool
+              with a session owned by the shared read
+        fresh: Skip the cache lookup and stale fallback (Cache-Control: no-cache).
+               The result is still stored, so it refreshes the entry for later reads.
+    """
+    if not fresh:
+        cached = content_cache.get(key)
+        if cached is not None:
+            return cached
+
+    version = content_cache.version
+
+    async def load() -> T:
+        result = await run_admitted(run_with_session, func, *args)
+        # Tagged with the version the read started under: a write during the
+        # query makes this entry stale immediately
+        content_cache.set(key, result, version=version)
+        return result
+
+    try:
+        return await read_flight.do((version, key), load)
+    except Overloaded:
+        if not fresh and settings.DB_STALE_FALLBACK:
+            stale = content_cache.get_stale(key)
+            if stale is not None:
+                db_admission.stale_served += 1
+                return stale
+        raise service_unavailable()
+
+
+async def cached_read_many(prefix: str, ids: List[Hashable], func: Callable[..., Dict[Hashable, T]]) -> Dict[Hashable, T]:
+    """
+    Read many items through the per-item cache entries (prefix, id)
+
+    Cached items are served on the event loop; only the missing IDs are loaded, in one
+    call to func(db, missing_ids) under single-flight and admission control. If that is
+    shed, missing items are answered from stale entries; 503 only if one has none.
+
+    Returns:
+        Dict of id -> item for the IDs that exist (absent IDs are left out)
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    found = {key[1]: item for key, item in content_cache.get_many((prefix, id_) for id_ in unique_ids).items()}
+    missing = [id_ for id_ in unique_ids if id_ not in found]
+    if not missing:
+        return found
+
+    version = content_cache.version
+
+    async def load() -> Dict[Hashable, T]:
+        loaded = await run_admitted(run_with_session, func, missing)
+        for id_, item in loaded.items():
+            content_cache.set((prefix, id_), item, version=version)
+        return loaded
+
+    try:
+        found.update(await read_flight.do((version, prefix, "many", tuple(missing)), load))
+        return found
+    except Overloaded:
+        if settings.DB_STALE_FALLBACK:
+            stale = {id_: content_cache.get_stale((prefix, id_)) for id_ in missing}
+            if all(item is not None for item in stale.values()):
+                db_admission.stale_served += 1
+                found.update(stale)
+                return found
+        raise service_unavailable()
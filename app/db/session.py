@@ -3,7 +3,7 @@ Database Session Management
 """
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, Callable, Generator, TypeVar
 
 from app.core.config import settings
 
@@ -17,6 +17,8 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+T = TypeVar("T")
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -33,3 +35,17 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def run_with_session(func: Callable[..., T], *args: Any) -> T:
+    """
+    Call func(db, *args) with a session owned by this call
+
+    For work shared between requests (single-flight reads), which must not borrow a
+    request-scoped session that is closed when that request ends.
+    """
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
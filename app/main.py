@@ -1,15 +1,20 @@
 """
 compro_assets - AURA Application
 """
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from atams.db import init_database
 from atams.logging import setup_logging_from_settings
 from atams.middleware import RequestIDMiddleware
 from atams.exceptions import setup_exception_handlers
 
+from app.core.admission import db_admission
+from app.core.cache import content_cache
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.single_flight import read_flight
 from app.api.v1.api import api_router
+from app.api.deps import require_min_role_level
 
 # Setup logging
 setup_logging_from_settings(settings)
@@ -28,6 +33,9 @@ app = FastAPI(
     },
 )
 
+# Rate limit middleware (added first so 429 responses still get CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -57,3 +65,17 @@ async def root():
 async def health():
     """Health check endpoint"""
     return {"status": "ok"}
+
+
+@app.get(
+    "/metrics",
+    tags=["Health"],
+    dependencies=[Depends(require_min_role_level(settings.METRICS_MIN_ROLE_LEVEL))]
+)
+async def metrics():
+    """Per-worker cache, request coalescing and DB admission counters (role_level >= METRICS_MIN_ROLE_LEVEL)"""
+    return {
+        "cache": content_cache.stats(),
+        "single_flight": read_flight.stats(),
+        "db_admission": db_admission.stats(),
+    }
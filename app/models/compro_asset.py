@@ -28,3 +28,8 @@ class ComproAsset(Base):
     created_by = Column(Text, nullable=False)
     updated_at = Column(TIMESTAMP, nullable=True)
     updated_by = Column(Text, nullable=True)
+
+    # Optimistic locking: every ORM UPDATE/DELETE checks and increments ca_version
+    ca_version = Column(Integer, nullable=False, server_default=text("1"))
+
+    __mapper_args__ = {"version_id_col": ca_version}
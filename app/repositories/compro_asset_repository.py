@@ -3,14 +3,24 @@ Compro Assets Repository
 """
 from typing import Optional, List
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy import select
+from sqlalchemy import select, bindparam, any_, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY
 from fastapi import HTTPException, status
 from atams.db.repository import BaseRepository
 from app.models.compro_asset import ComproAsset
 from app.models.compro_category import ComproCategory
 
 
+def _conflict() -> HTTPException:
+    """409 for a row whose ca_version changed since it was loaded (StaleDataError)"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Asset was modified by another request. Reload and try again."
+    )
+
+
 class ComproAssetRepository(BaseRepository[ComproAsset]):
     """Repository for ComproAsset operations"""
 
@@ -52,53 +62,57 @@ class ComproAssetRepository(BaseRepository[ComproAsset]):
             })
         return results
 
+    # Columns returned by the detail queries (get_by_id, get_by_ids)
+    DETAIL_COLUMNS = (
+        ComproAsset.ca_id,
+        ComproAsset.ca_title,
+        ComproAsset.ca_tagline,
+        ComproAsset.ca_image,
+        ComproAsset.ca_image_carousel,
+        ComproAsset.ca_subtitle,
+        ComproAsset.ca_link,
+        ComproAsset.ca_cc_id,
+        ComproAsset.created_at,
+        ComproAsset.created_by,
+        ComproAsset.updated_at,
+        ComproAsset.updated_by,
+        ComproAsset.ca_version,
+        ComproCategory.cc_id,
+        ComproCategory.cc_name
+    )
+
+    def _detail_query(self, db: Session):
+        """Detail columns with category join"""
+        return (
+            db.query(*self.DETAIL_COLUMNS)
+            .outerjoin(ComproCategory, ComproAsset.ca_cc_id == ComproCategory.cc_id)
+        )
+
     def get_by_id(self, db: Session, ca_id: int) -> Optional[dict]:
         """
         Get compro asset by ID with category join
         Returns dictionary with asset and category data
         """
-        query = (
-            db.query(
-                ComproAsset.ca_id,
-                ComproAsset.ca_title,
-                ComproAsset.ca_tagline,
-                ComproAsset.ca_image,
-                ComproAsset.ca_image_carousel,
-                ComproAsset.ca_subtitle,
-                ComproAsset.ca_link,
-                ComproAsset.ca_cc_id,
-                ComproAsset.created_at,
-                ComproAsset.created_by,
-                ComproAsset.updated_at,
-                ComproAsset.updated_by,
-                ComproCategory.cc_id,
-                ComproCategory.cc_name
-            )
-            .outerjoin(ComproCategory, ComproAsset.ca_cc_id == ComproCategory.cc_id)
-            .filter(ComproAsset.ca_id == ca_id)
-            .first()
-        )
+        row = self._detail_query(db).filter(ComproAsset.ca_id == ca_id).first()
 
-        if not query:
+        if not row:
             return None
 
         # Convert to dict for easier schema mapping
-        return {
-            "ca_id": query.ca_id,
-            "ca_title": query.ca_title,
-            "ca_tagline": query.ca_tagline,
-            "ca_image": query.ca_image,
-            "ca_image_carousel": query.ca_image_carousel,
-            "ca_subtitle": query.ca_subtitle,
-            "ca_link": query.ca_link,
-            "ca_cc_id": query.ca_cc_id,
-            "created_at": query.created_at,
-            "created_by": query.created_by,
-            "updated_at": query.updated_at,
-            "updated_by": query.updated_by,
-            "cc_id": query.cc_id,
-            "cc_name": query.cc_name
-        }
+        return dict(row._mapping)
+
+    def get_by_ids(self, db: Session, ca_ids: List[int]) -> List[dict]:
+        """
+        Get compro assets by IDs with category join in a single query
+        Uses `ca_id = ANY(:ca_ids)` so the statement is the same for any number of IDs
+        Returns list of dictionaries (unordered, missing IDs are absent)
+        """
+        if not ca_ids:
+            return []
+
+        ids_param = bindparam("ca_ids", value=list(ca_ids), type_=ARRAY(BigInteger))
+        rows = self._detail_query(db).filter(ComproAsset.ca_id == any_(ids_param)).all()
+        return [dict(row._mapping) for row in rows]
 
     def create(self, db: Session, data: dict) -> ComproAsset:
         """Create new compro asset"""
@@ -136,12 +150,18 @@ class ComproAssetRepository(BaseRepository[ComproAsset]):
 
     def update(self, db: Session, ca_id: int, data: dict) -> Optional[ComproAsset]:
         """Update compro asset"""
-        try:
-            # Query the actual SQLAlchemy model object, not dict
-            db_obj = self.get_model_by_id(db, ca_id)
-            if not db_obj:
-                return None
+        # Query the actual SQLAlchemy model object, not dict
+        db_obj = self.get_model_by_id(db, ca_id)
+        if not db_obj:
+            return None
+        return self.update_model(db, db_obj, data)
 
+    def update_model(self, db: Session, db_obj: ComproAsset, data: dict) -> ComproAsset:
+        """
+        Update an already loaded compro asset
+        The ORM only writes columns whose value actually changed, plus ca_version
+        """
+        try:
             # Update only the fields that are provided
             for key, value in data.items():
                 if hasattr(db_obj, key):
@@ -150,6 +170,9 @@ class ComproAssetRepository(BaseRepository[ComproAsset]):
             db.commit()
             db.refresh(db_obj)
             return db_obj
+        except StaleDataError:
+            db.rollback()
+            raise _conflict()
         except IntegrityError as e:
             db.rollback()
             # Check if it's a foreign key constraint error
@@ -180,6 +203,9 @@ class ComproAssetRepository(BaseRepository[ComproAsset]):
             db.delete(db_obj)
             db.commit()
             return True
+        except StaleDataError:
+            db.rollback()
+            raise _conflict()
         except SQLAlchemyError as e:
             db.rollback()
             raise HTTPException(
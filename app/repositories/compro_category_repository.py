@@ -2,8 +2,10 @@
 Compro Category Repository
 """
 from typing import List
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 from atams.db.repository import BaseRepository
+from app.models.compro_asset import ComproAsset
 from app.models.compro_category import ComproCategory
 
 
@@ -16,3 +18,69 @@ class ComproCategoryRepository(BaseRepository[ComproCategory]):
     def get_all(self, db: Session) -> List[ComproCategory]:
         """Get all compro categories"""
         return db.query(ComproCategory).order_by(ComproCategory.cc_name).all()
+
+    def get_all_with_assets(self, db: Session, per_category: int) -> List[dict]:
+        """
+        Get all categories with their asset count and first N assets (by ca_id)
+        Single statement: row_number()/count() window functions per category, joined
+        back to categories so empty categories are included with asset_count 0
+        Returns list of dictionaries ordered by category name
+        """
+        ranked = (
+            select(
+                ComproAsset.ca_id,
+                ComproAsset.ca_title,
+                ComproAsset.ca_image,
+                ComproAsset.ca_link,
+                ComproAsset.ca_subtitle,
+                ComproAsset.ca_cc_id,
+                func.row_number().over(
+                    partition_by=ComproAsset.ca_cc_id,
+                    order_by=ComproAsset.ca_id
+                ).label("rn"),
+                func.count().over(partition_by=ComproAsset.ca_cc_id).label("asset_count")
+            )
+            .where(ComproAsset.ca_cc_id.isnot(None))
+            .subquery()
+        )
+
+        rows = (
+            db.query(
+                ComproCategory.cc_id,
+                ComproCategory.cc_name,
+                ranked.c.ca_id,
+                ranked.c.ca_title,
+                ranked.c.ca_image,
+                ranked.c.ca_link,
+                ranked.c.ca_subtitle,
+                ranked.c.asset_count
+            )
+            .outerjoin(
+                ranked,
+                and_(ranked.c.ca_cc_id == ComproCategory.cc_id, ranked.c.rn <= per_category)
+            )
+            .order_by(ComproCategory.cc_name, ComproCategory.cc_id, ranked.c.rn)
+            .all()
+        )
+
+        # Group flat rows into one dict per category
+        results = []
+        for row in rows:
+            if not results or results[-1]["cc_id"] != row.cc_id:
+                results.append({
+                    "cc_id": row.cc_id,
+                    "cc_name": row.cc_name,
+                    "asset_count": row.asset_count or 0,
+                    "assets": []
+                })
+            if row.ca_id is not None:
+                results[-1]["assets"].append({
+                    "ca_id": row.ca_id,
+                    "ca_title": row.ca_title,
+                    "ca_image": row.ca_image,
+                    "ca_link": row.ca_link,
+                    "ca_subtitle": row.ca_subtitle,
+                    "cc_id": row.cc_id,
+                    "cc_name": row.cc_name
+                })
+        return results
@@ -59,11 +59,19 @@ class ComproAsset(ComproAssetBase):
     created_by: str
     updated_at: Optional[datetime] = None
     updated_by: Optional[str] = None
+    ca_version: int = Field(..., description="Row version, sent back as ETag / If-Match")
 
     class Config:
         from_attributes = True
 
 
+class ComproAssetBatchItem(BaseModel):
+    """Schema for one entry of a batch lookup (request order, found=False when missing)"""
+    ca_id: int
+    found: bool
+    data: Optional[ComproAsset] = None
+
+
 class ComproAssetList(BaseModel):
     """Schema for ComproAsset list (simplified)"""
     ca_id: int
@@ -2,8 +2,11 @@
 Compro Category Schemas
 """
 from datetime import datetime
+from typing import List
 from pydantic import BaseModel
 
+from app.schemas.compro_asset import ComproAssetList
+
 
 class ComproCategory(BaseModel):
     """Schema for ComproCategory (list response)"""
@@ -12,3 +15,9 @@ class ComproCategory(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ComproCategoryWithAssets(ComproCategory):
+    """Schema for ComproCategory with asset count and first N assets"""
+    asset_count: int
+    assets: List[ComproAssetList]
@@ -1,13 +1,16 @@
 """
 Compro Assets Service
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.core.cache import content_cache
 from app.repositories.compro_asset_repository import ComproAssetRepository
-from app.schemas.compro_asset import ComproAsset, ComproAssetCreate, ComproAssetUpdate, ComproAssetList
+from app.schemas.compro_asset import (
+    ComproAsset, ComproAssetCreate, ComproAssetUpdate, ComproAssetList
+)
 
 
 class ComproAssetService:
@@ -28,6 +31,7 @@ class ComproAssetService:
         """
         Get asset by ID (public endpoint)
         Returns full detail with category info
+        Endpoint caches the result under ("asset", ca_id), shared with get_assets_by_ids
         """
         asset = self.repository.get_by_id(db, ca_id)
         if not asset:
@@ -37,6 +41,16 @@ class ComproAssetService:
             )
         return ComproAsset(**asset)
 
+    def get_assets_by_ids(self, db: Session, ca_ids: List[int]) -> Dict[int, ComproAsset]:
+        """
+        Get many assets by ID in one query (public endpoint)
+        The endpoint serves cached IDs itself (cached_read_many) and only passes the rest;
+        results are cached under ("asset", ca_id), shared with get_asset_by_id.
+        Returns dict of ca_id -> asset; missing IDs are absent
+        """
+        assets = (ComproAsset(**row) for row in self.repository.get_by_ids(db, ca_ids))
+        return {asset.ca_id: asset for asset in assets}
+
     def create_asset(
         self,
         db: Session,
@@ -55,6 +69,7 @@ class ComproAssetService:
 
         # Create asset
         new_asset = self.repository.create(db, data)
+        content_cache.bump()
         return ComproAsset.model_validate(new_asset)
 
     def update_asset(
@@ -62,19 +77,22 @@ class ComproAssetService:
         db: Session,
         ca_id: int,
         asset_data: ComproAssetUpdate,
-        current_user: dict
+        current_user: dict,
+        if_match: Optional[List[int]] = None
     ) -> ComproAsset:
         """
         Update existing asset
+        if_match: accepted row versions (from If-Match); None skips the check
         Authorization already validated by endpoint dependency
         """
         # Check if asset exists
-        existing = self.repository.get_by_id(db, ca_id)
-        if not existing:
+        db_obj = self.repository.get_model_by_id(db, ca_id)
+        if not db_obj:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Asset with ID {ca_id} not found"
             )
+        self._check_if_match(db_obj, if_match)
 
         # Prepare data with audit fields (only update fields, don't touch created_*)
         data = asset_data.model_dump()
@@ -83,9 +101,57 @@ class ComproAssetService:
         # Don't modify created_at and created_by
 
         # Update asset
-        updated_asset = self.repository.update(db, ca_id, data)
+        updated_asset = self.repository.update_model(db, db_obj, data)
+        content_cache.bump()
+        return ComproAsset.model_validate(updated_asset)
+
+    def patch_asset(
+        self,
+        db: Session,
+        ca_id: int,
+        asset_data: ComproAssetUpdate,
+        current_user: dict,
+        if_match: Optional[List[int]] = None
+    ) -> ComproAsset:
+        """
+        Partially update existing asset
+        Only fields sent by the client and different from the stored value are written.
+        If nothing changes, no UPDATE is issued and the audit fields stay untouched.
+        if_match: accepted row versions (from If-Match); None skips the check
+        Authorization already validated by endpoint dependency
+        """
+        db_obj = self.repository.get_model_by_id(db, ca_id)
+        if not db_obj:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Asset with ID {ca_id} not found"
+            )
+        self._check_if_match(db_obj, if_match)
+
+        # Minimal diff: fields the client sent that differ from the stored row
+        changes = {
+            key: value
+            for key, value in asset_data.model_dump(exclude_unset=True).items()
+            if getattr(db_obj, key) != value
+        }
+        if not changes:
+            return ComproAsset.model_validate(db_obj)
+
+        changes["updated_by"] = current_user.get("username", "system")
+        changes["updated_at"] = datetime.now()
+
+        updated_asset = self.repository.update_model(db, db_obj, changes)
+        content_cache.bump()
         return ComproAsset.model_validate(updated_asset)
 
+    def _check_if_match(self, db_obj, if_match: Optional[List[int]]) -> None:
+        """Raise 412 if the stored row version is not one the client accepted"""
+        if if_match is not None and db_obj.ca_version not in if_match:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"Asset with ID {db_obj.ca_id} has changed (current version {db_obj.ca_version})"
+            )
+
     def delete_asset(
         self,
         db: Session,
@@ -105,3 +171,4 @@ class ComproAssetService:
 
         # Delete asset
         self.repository.delete(db, ca_id)
+        content_cache.bump()
@@ -5,7 +5,7 @@ from typing import List
 from sqlalchemy.orm import Session
 
 from app.repositories.compro_category_repository import ComproCategoryRepository
-from app.schemas.compro_category import ComproCategory
+from app.schemas.compro_category import ComproCategory, ComproCategoryWithAssets
 
 
 class ComproCategoryService:
@@ -21,3 +21,11 @@ class ComproCategoryService:
         """
         categories = self.repository.get_all(db)
         return [ComproCategory.model_validate(cat) for cat in categories]
+
+    def get_all_categories_with_assets(self, db: Session, per_category: int) -> List[ComproCategoryWithAssets]:
+        """
+        Get all categories with asset count and first N assets (public endpoint)
+        One query for the whole navigation; cached per content version by the endpoint
+        """
+        categories = self.repository.get_all_with_assets(db, per_category)
+        return [ComproCategoryWithAssets(**category) for category in categories]
@@ -0,0 +1,168 @@
+"""
+Benchmark response serialization per endpoint
+
+Compares, per endpoint, with synthetic rows (no database needed):
+- validated: rows validated into schemas, then response_model validates and dumps again
+  (the path before app/core/serialization.py)
+- construct: rows built with model_construct, rendered directly
+- trusted:   rows validated once, rendered directly (what the endpoints use)
+
+Also checks all paths produce identical bytes.
+
+Usage:
+    python -m scripts.benchmark_serialization [--rows 200] [--repeat 2000]
+"""
+import argparse
+import timeit
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+from app.core.serialization import render_trusted, render_validated
+from app.schemas.common import DataResponse
+from app.schemas.compro_asset import ComproAsset, ComproAssetBatchItem, ComproAssetList
+from app.schemas.compro_category import ComproCategory, ComproCategoryWithAssets
+
+
+def make_detail_row(i: int) -> dict:
+    return {
+        "ca_id": i,
+        "ca_title": f"Asset {i}",
+        "ca_tagline": "Tagline",
+        "ca_image": f"/portofolio/{i}.png",
+        "ca_image_carousel": [f"/carousel/{i}-{n}.png" for n in range(5)],
+        "ca_subtitle": "Subtitle",
+        "ca_link": "https://example.com",
+        "ca_cc_id": i % 5 + 1,
+        "created_at": datetime(2024, 1, 1, 12, 0, 0),
+        "created_by": "admin",
+        "updated_at": None,
+        "updated_by": None,
+        "ca_version": 1,
+        "cc_id": i % 5 + 1,
+        "cc_name": f"Category {i % 5 + 1}",
+    }
+
+
+def make_list_row(i: int) -> dict:
+    row = make_detail_row(i)
+    keys = ("ca_id", "ca_title", "ca_image", "ca_subtitle", "ca_link", "ca_cc_id", "cc_id", "cc_name")
+    return {key: row[key] for key in keys}
+
+
+def make_orm_row(i: int) -> SimpleNamespace:
+    row = make_detail_row(i)
+    del row["cc_id"], row["cc_name"]
+    return SimpleNamespace(**row)
+
+
+def make_category_with_assets(cc_id: int, per_category: int) -> dict:
+    assets = [make_list_row(cc_id * 100 + n) for n in range(per_category)]
+    return {"cc_id": cc_id, "cc_name": f"Category {cc_id}", "asset_count": per_category * 2, "assets": assets}
+
+
+def construct(schema, source):
+    """model_construct from a dict or attribute object (validation skipped entirely)"""
+    if isinstance(source, dict):
+        values = {name: source[name] for name in schema.model_fields if name in source}
+    else:
+        values = {name: getattr(source, name) for name in schema.model_fields if hasattr(source, name)}
+    return schema.model_construct(**values)
+
+
+def build_cases(rows: int):
+    """(name, response model, build data per path) per endpoint"""
+    list_rows = [make_list_row(i) for i in range(rows)]
+    detail_row = make_detail_row(1)
+    orm_row = make_orm_row(1)
+    category_rows = [SimpleNamespace(cc_id=i, cc_name=f"Category {i}") for i in range(10)]
+    # Batch of 20 IDs, every fifth one missing
+    batch_rows = {i: make_detail_row(i) for i in range(20) if i % 5}
+    categories_with_assets = [make_category_with_assets(i, 5) for i in range(10)]
+
+    return [
+        (
+            f"GET /assets ({rows} rows)",
+            DataResponse[List[ComproAssetList]],
+            lambda: [ComproAssetList(**row) for row in list_rows],
+            lambda: [construct(ComproAssetList, row) for row in list_rows],
+        ),
+        (
+            "GET /assets/{ca_id}",
+            DataResponse[ComproAsset],
+            lambda: ComproAsset(**detail_row),
+            lambda: construct(ComproAsset, detail_row),
+        ),
+        (
+            "POST/PUT /assets",
+            DataResponse[ComproAsset],
+            lambda: ComproAsset.model_validate(orm_row),
+            lambda: construct(ComproAsset, orm_row),
+        ),
+        (
+            "GET /categories",
+            DataResponse[List[ComproCategory]],
+            lambda: [ComproCategory.model_validate(c) for c in category_rows],
+            lambda: [construct(ComproCategory, c) for c in category_rows],
+        ),
+        (
+            "GET /assets/batch (20)",
+            DataResponse[List[ComproAssetBatchItem]],
+            lambda: [
+                ComproAssetBatchItem(
+                    ca_id=i, found=i in batch_rows, data=ComproAsset(**batch_rows[i]) if i in batch_rows else None
+                )
+                for i in range(20)
+            ],
+            lambda: [
+                ComproAssetBatchItem.model_construct(
+                    ca_id=i, found=i in batch_rows,
+                    data=construct(ComproAsset, batch_rows[i]) if i in batch_rows else None
+                )
+                for i in range(20)
+            ],
+        ),
+        (
+            "GET /categories?include=assets",
+            DataResponse[List[ComproCategoryWithAssets]],
+            lambda: [ComproCategoryWithAssets(**c) for c in categories_with_assets],
+            lambda: [
+                ComproCategoryWithAssets.model_construct(
+                    cc_id=c["cc_id"], cc_name=c["cc_name"], asset_count=c["asset_count"],
+                    assets=[construct(ComproAssetList, a) for a in c["assets"]]
+                )
+                for c in categories_with_assets
+            ],
+        ),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="Rows in list responses")
+    parser.add_argument("--repeat", type=int, default=2000, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    def measure(fn) -> float:
+        return min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat * 1e6
+
+    print(f"{'endpoint':<32}{'validated (us)':>16}{'construct (us)':>16}{'trusted (us)':>14}{'speedup':>9}")
+    for name, model, validate, build in build_cases(args.rows):
+        paths = {
+            "validated": lambda: render_validated(model, model(success=True, message="ok", data=validate())),
+            "construct": lambda: render_trusted(model.model_construct(success=True, message="ok", data=build())),
+            "trusted": lambda: render_trusted(model.model_construct(success=True, message="ok", data=validate())),
+        }
+        outputs = {path: fn() for path, fn in paths.items()}
+        if len(set(outputs.values())) != 1:
+            raise AssertionError(f"{name}: serialization paths produce different output")
+
+        timings = {path: measure(fn) for path, fn in paths.items()}
+        print(
+            f"{name:<32}{timings['validated']:>16.1f}{timings['construct']:>16.1f}"
+            f"{timings['trusted']:>14.1f}{timings['validated'] / timings['trusted']:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
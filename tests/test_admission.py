@@ -0,0 +1,263 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import admission, single_flight
+from app.core.admission import AdmissionController, Overloaded, run_db
+from app.core.cache import ContentCache
+from app.core.config import settings
+
+
+async def settle():
+    """Let every ready task run until it blocks"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_acquire_within_limit_does_not_queue():
+    async def scenario():
+        controller = AdmissionController(limit=2, max_queue=1, timeout=1)
+        await controller.acquire()
+        await controller.acquire()
+        assert controller.stats()["active"] == 2
+        assert controller.stats()["queue_depth"] == 0
+        controller.release()
+        controller.release()
+        assert controller.stats()["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_slot_to_oldest_waiter():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=2, timeout=1)
+        await controller.acquire()
+        order = []
+
+        async def waiter(name):
+            await controller.acquire()
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(waiter(name)) for name in ("first", "second")]
+        await settle()
+        assert controller.stats()["queue_depth"] == 2
+
+        controller.release()
+        await settle()
+        # The slot moved to the waiter without ever being free
+        assert order == ["first"]
+        assert controller.stats()["active"] == 1
+
+        controller.release()
+        await asyncio.gather(*tasks)
+        assert order == ["first", "second"]
+        assert controller.stats()["admitted"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_new_request_does_not_jump_the_queue():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=2, timeout=1)
+        await controller.acquire()
+        queued = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        controller.release()
+        # The slot is reserved for the queued request, so a newcomer must wait too
+        newcomer = asyncio.ensure_future(controller.acquire())
+        await settle()
+        assert queued.done()
+        assert not newcomer.done()
+        newcomer.cancel()
+        await settle()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_sheds_immediately():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=1, timeout=1)
+        await controller.acquire()
+        queued = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        with pytest.raises(Overloaded):
+            await controller.acquire()
+        assert controller.stats()["shed"] == 1
+        assert controller.stats()["queue_depth"] == 1
+
+        queued.cancel()
+        await settle()
+
+    asyncio.run(scenario())
+
+
+def test_wait_timeout_is_counted_and_leaves_queue():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=1, timeout=0.01)
+        await controller.acquire()
+
+        with pytest.raises(Overloaded):
+            await controller.acquire()
+        stats = controller.stats()
+        assert stats["timed_out"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["active"] == 1
+
+        controller.release()
+        assert controller.stats()["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancel_while_queued_leaves_queue_without_taking_slot():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=2, timeout=1)
+        await controller.acquire()
+        queued = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        queued.cancel()
+        await settle()
+        assert queued.cancelled()
+        assert controller.stats()["queue_depth"] == 0
+        assert controller.stats()["timed_out"] == 0
+
+        controller.release()
+        assert controller.stats()["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_over_while_waiter_gives_up_is_passed_on():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=2, timeout=1)
+        await controller.acquire()
+        leaving = asyncio.ensure_future(controller.acquire())
+        next_in_line = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        # Hand the slot to `leaving`, which is cancelled before it can resume. Depending
+        # on the Python version, wait_for either swallows the cancel (leaving keeps the
+        # slot) or raises it (the slot passes to next_in_line). Either way, no slot leaks.
+        controller.release()
+        leaving.cancel()
+        await settle()
+
+        holders = [task for task in (leaving, next_in_line) if task.done() and not task.cancelled()]
+        assert len(holders) == 1
+        assert controller.stats()["active"] == 1
+
+        controller.release()
+        await settle()
+        if not leaving.cancelled():
+            assert next_in_line.done()
+            controller.release()
+        assert controller.stats()["active"] == 0
+        assert controller.stats()["queue_depth"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_over_as_wait_times_out_is_passed_on(monkeypatch):
+    real_wait_for = asyncio.wait_for
+    controller = AdmissionController(limit=1, max_queue=2, timeout=1)
+    deadline = asyncio.Event()
+
+    async def wait_for(future, timeout):
+        if future is controller._waiters[0]:
+            # The holder releases (handing this waiter the slot) right as the deadline fires
+            await deadline.wait()
+            controller.release()
+            raise asyncio.TimeoutError
+        return await real_wait_for(future, timeout)
+
+    monkeypatch.setattr(admission.asyncio, "wait_for", wait_for)
+
+    async def scenario():
+        await controller.acquire()
+        timing_out = asyncio.ensure_future(controller.acquire())
+        await settle()
+        next_in_line = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        deadline.set()
+        with pytest.raises(Overloaded):
+            await timing_out
+        await settle()
+        assert next_in_line.done()
+        stats = controller.stats()
+        assert stats["timed_out"] == 1
+        assert stats["active"] == 1
+        assert stats["queue_depth"] == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    """A controller with no capacity, so every admitted call is shed"""
+    controller = AdmissionController(limit=0, max_queue=0, timeout=1)
+    monkeypatch.setattr(settings, "DB_ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "DB_SHED_RETRY_AFTER", 3)
+    monkeypatch.setattr(admission, "db_admission", controller)
+    monkeypatch.setattr(single_flight, "db_admission", controller)
+    return controller
+
+
+def test_run_db_sheds_with_503_and_retry_after(saturated):
+    app = FastAPI()
+
+    @app.post("/write")
+    async def write():
+        await run_db(lambda: None)
+        return {"ok": True}
+
+    response = TestClient(app).post("/write")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert saturated.stats()["shed"] == 1
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ContentCache(ttl=30, stale_ttl=300)
+    monkeypatch.setattr(single_flight, "content_cache", cache)
+    return cache
+
+
+def never_called(db):
+    raise AssertionError("shed reads must not run")
+
+
+def test_shed_read_serves_stale_entry(saturated, cache, monkeypatch):
+    monkeypatch.setattr(settings, "DB_STALE_FALLBACK", True)
+    cache.set(("assets",), ["old"])
+    cache.bump()
+
+    result = asyncio.run(single_flight.cached_read(("assets",), never_called))
+    assert result == ["old"]
+    assert saturated.stats()["stale_served"] == 1
+
+
+def test_shed_read_without_stale_entry_is_503(saturated, cache, monkeypatch):
+    monkeypatch.setattr(settings, "DB_STALE_FALLBACK", True)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(single_flight.cached_read(("assets",), never_called))
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "3"
+
+
+def test_shed_read_ignores_stale_entry_when_fallback_disabled(saturated, cache, monkeypatch):
+    monkeypatch.setattr(settings, "DB_STALE_FALLBACK", False)
+    cache.set(("assets",), ["old"])
+    cache.bump()
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(single_flight.cached_read(("assets",), never_called))
+    assert exc_info.value.status_code == 503
+    assert saturated.stats()["stale_served"] == 0
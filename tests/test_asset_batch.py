@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import compro_assets
+from app.api.v1.endpoints.compro_assets import MAX_ASSET_ID, parse_ids
+from app.core import admission, single_flight
+from app.core.admission import AdmissionController
+from app.core.cache import ContentCache
+from app.core.config import settings
+from app.schemas.compro_asset import ComproAsset
+
+
+def test_parse_ids_accepts_repeated_and_comma_separated():
+    assert parse_ids(["1,2", "3", " 4 , "]) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [""],
+        ["a"],
+        ["0"],
+        ["-1"],
+        [str(MAX_ASSET_ID + 1)],
+        [",".join(str(ca_id) for ca_id in range(1, 102))],
+    ],
+)
+def test_parse_ids_rejects_invalid_input(values):
+    with pytest.raises(HTTPException) as exc_info:
+        parse_ids(values)
+    assert exc_info.value.status_code == 400
+
+
+def test_parse_ids_accepts_bigint_bounds():
+    assert parse_ids(["1", str(MAX_ASSET_ID)]) == [1, MAX_ASSET_ID]
+
+
+def test_invalid_batch_is_rejected_before_any_read(monkeypatch):
+    from app.main import app
+
+    async def no_read(*args, **kwargs):
+        raise AssertionError("invalid requests must not reach the cache or DB")
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(compro_assets, "cached_read_many", no_read)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/assets/batch", params={"ids": str(MAX_ASSET_ID + 1)})
+    assert response.status_code == 400
+
+    response = client.get("/api/v1/assets/batch", params={"ids": ","})
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ContentCache(ttl=30, stale_ttl=300)
+    monkeypatch.setattr(single_flight, "content_cache", cache)
+    monkeypatch.setattr(single_flight, "run_with_session", lambda func, *args: func(None, *args))
+    return cache
+
+
+def make_asset(ca_id: int) -> ComproAsset:
+    return ComproAsset(ca_id=ca_id, ca_title=f"Asset {ca_id}", created_at=datetime(2024, 1, 1), created_by="author", ca_version=1)
+
+
+def test_fully_cached_batch_never_takes_admission_slot(cache, monkeypatch):
+    from app.main import app
+
+    async def no_admission(*args):
+        raise AssertionError("cached batches must not reach admission control")
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(single_flight, "run_admitted", no_admission)
+    cache.set(("asset", 1), make_asset(1))
+    cache.set(("asset", 2), make_asset(2))
+
+    response = TestClient(app).get("/api/v1/assets/batch", params={"ids": "2,1,2"})
+    assert response.status_code == 200
+    assert [item["ca_id"] for item in response.json()["data"]] == [2, 1, 2]
+    assert all(item["found"] for item in response.json()["data"])
+
+
+def test_batch_loads_only_missing_ids_and_caches_them(cache, monkeypatch):
+    monkeypatch.setattr(settings, "DB_ADMISSION_ENABLED", False)
+    cache.set(("asset", 1), make_asset(1))
+    calls = []
+
+    def load(db, ca_ids):
+        calls.append(list(ca_ids))
+        return {ca_id: make_asset(ca_id) for ca_id in ca_ids if ca_id != 404}
+
+    found = asyncio.run(single_flight.cached_read_many("asset", [1, 2, 404, 2], load))
+    assert sorted(found) == [1, 2]
+    assert calls == [[2, 404]]
+    assert cache.get(("asset", 2)) == make_asset(2)
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    controller = AdmissionController(limit=0, max_queue=0, timeout=1)
+    monkeypatch.setattr(settings, "DB_ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "DB_STALE_FALLBACK", True)
+    monkeypatch.setattr(admission, "db_admission", controller)
+    monkeypatch.setattr(single_flight, "db_admission", controller)
+    return controller
+
+
+def never_called(db, ca_ids):
+    raise AssertionError("shed reads must not run")
+
+
+def test_overloaded_batch_serves_fresh_and_stale_entries(cache, saturated):
+    cache.set(("asset", 1), make_asset(1))
+    cache.set(("asset", 2), make_asset(2))
+    cache.bump()
+    cache.set(("asset", 3), make_asset(3))
+
+    found = asyncio.run(single_flight.cached_read_many("asset", [1, 2, 3], never_called))
+    assert sorted(found) == [1, 2, 3]
+    assert saturated.stats()["stale_served"] == 1
+
+
+def test_overloaded_batch_is_503_when_an_id_has_no_entry(cache, saturated):
+    cache.set(("asset", 1), make_asset(1))
+    cache.bump()
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(single_flight.cached_read_many("asset", [1, 2], never_called))
+    assert exc_info.value.status_code == 503
@@ -0,0 +1,221 @@
+from types import SimpleNamespace
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.api import deps
+from app.api.v1.endpoints import compro_assets
+from app.api.v1.endpoints.compro_assets import parse_if_match
+from app.core.cache import ContentCache
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.compro_asset_repository import ComproAssetRepository
+from app.schemas.compro_asset import ComproAssetUpdate
+from app.services import compro_asset_service
+from app.services.compro_asset_service import ComproAssetService
+
+USER = {"username": "editor"}
+
+
+def make_row(**overrides):
+    row = dict(
+        ca_id=1,
+        ca_title="Title",
+        ca_tagline="Tagline",
+        ca_image="/image.png",
+        ca_image_carousel=[],
+        ca_subtitle=None,
+        ca_link=None,
+        ca_cc_id=None,
+        cc_id=None,
+        cc_name=None,
+        created_at=datetime(2024, 1, 1),
+        created_by="author",
+        updated_at=None,
+        updated_by=None,
+        ca_version=3,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+class FakeRepository:
+    def __init__(self, row):
+        self.row = row
+        self.writes = []
+
+    def get_model_by_id(self, db, ca_id):
+        return self.row if ca_id == self.row.ca_id else None
+
+    def update_model(self, db, db_obj, data):
+        self.writes.append(data)
+        for key, value in data.items():
+            setattr(db_obj, key, value)
+        db_obj.ca_version += 1
+        return db_obj
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ContentCache()
+    monkeypatch.setattr(compro_asset_service, "content_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def repository():
+    return FakeRepository(make_row())
+
+
+@pytest.fixture
+def service(repository):
+    service = ComproAssetService()
+    service.repository = repository
+    return service
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("*", None),
+        ('"3"', [3]),
+        ('"3", "4"', [3, 4]),
+        ('W/"3"', []),
+        ('W/"3", "4"', [4]),
+        ("3", []),
+        ('"abc"', []),
+    ],
+)
+def test_parse_if_match_uses_strong_comparison(header, expected):
+    assert parse_if_match(header) == expected
+
+
+def test_patch_writes_only_changed_fields(service, repository, cache):
+    patch = ComproAssetUpdate(ca_title="Title", ca_tagline="New tagline")
+    result = service.patch_asset(None, 1, patch, USER)
+
+    assert len(repository.writes) == 1
+    written = repository.writes[0]
+    # ca_title was sent but unchanged; unsent fields are not written at all
+    assert set(written) == {"ca_tagline", "updated_by", "updated_at"}
+    assert written["updated_by"] == "editor"
+    assert result.ca_tagline == "New tagline"
+    assert result.ca_version == 4
+    assert cache.version == 1
+
+
+def test_patch_without_changes_skips_write_and_audit_fields(service, repository, cache):
+    result = service.patch_asset(None, 1, ComproAssetUpdate(ca_title="Title"), USER)
+
+    assert repository.writes == []
+    assert result.updated_by is None
+    assert result.updated_at is None
+    assert result.ca_version == 3
+    assert cache.version == 0
+
+
+def test_patch_with_matching_if_match_is_applied(service, repository, cache):
+    service.patch_asset(None, 1, ComproAssetUpdate(ca_title="New"), USER, if_match=[2, 3])
+    assert repository.writes[0]["ca_title"] == "New"
+
+
+@pytest.mark.parametrize("method", ["patch_asset", "update_asset"])
+def test_mismatched_if_match_is_412(service, repository, cache, method):
+    with pytest.raises(HTTPException) as exc_info:
+        getattr(service, method)(None, 1, ComproAssetUpdate(ca_title="New"), USER, if_match=[2])
+    assert exc_info.value.status_code == 412
+    assert repository.writes == []
+    assert cache.version == 0
+
+
+@pytest.mark.parametrize("method", ["patch_asset", "update_asset"])
+def test_missing_asset_is_404(service, method):
+    with pytest.raises(HTTPException) as exc_info:
+        getattr(service, method)(None, 2, ComproAssetUpdate(ca_title="New"), USER)
+    assert exc_info.value.status_code == 404
+
+
+class StaleSession:
+    def __init__(self):
+        self.rolled_back = False
+
+    def commit(self):
+        raise StaleDataError("UPDATE statement on table expected to update 1 row(s); 0 were matched.")
+
+    def delete(self, obj):
+        pass
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def test_concurrent_version_change_is_409():
+    db = StaleSession()
+    with pytest.raises(HTTPException) as exc_info:
+        ComproAssetRepository().update_model(db, make_row(), {"ca_title": "New"})
+    assert exc_info.value.status_code == 409
+    assert db.rolled_back
+
+
+def test_delete_of_concurrently_changed_row_is_409(monkeypatch):
+    repository = ComproAssetRepository()
+    monkeypatch.setattr(repository, "get_model_by_id", lambda db, ca_id: make_row())
+    db = StaleSession()
+    with pytest.raises(HTTPException) as exc_info:
+        repository.delete(db, 1)
+    assert exc_info.value.status_code == 409
+    assert db.rolled_back
+
+
+@pytest.fixture
+def client(monkeypatch, repository, cache):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(compro_assets.service, "repository", repository)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[deps.require_auth] = lambda: USER
+    for route in compro_assets.router.routes:
+        for dependency in route.dependencies:
+            app.dependency_overrides[dependency.dependency] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("method", ["PUT", "PATCH"])
+def test_write_endpoints_honor_if_match(client, method):
+    body = {"ca_title": "New"}
+
+    response = client.request(method, "/api/v1/assets/1", json=body, headers={"If-Match": 'W/"3"'})
+    assert response.status_code == 412
+
+    response = client.request(method, "/api/v1/assets/1", json=body, headers={"If-Match": '"3"'})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"4"'
+
+
+@pytest.mark.parametrize(
+    "header, fresh",
+    [(None, False), ("max-age=60", False), ("no-cache", True), ("max-age=0, No-Cache", True)],
+)
+def test_wants_fresh(header, fresh):
+    assert compro_assets.wants_fresh(header) is fresh
+
+
+def test_no_cache_get_bypasses_stale_cached_etag(client, monkeypatch):
+    reads = []
+
+    async def cached_read(key, func, *args, fresh=False):
+        reads.append(fresh)
+        return compro_asset_service.ComproAsset.model_validate(make_row(ca_version=5))
+
+    monkeypatch.setattr(compro_assets, "cached_read", cached_read)
+
+    client.get("/api/v1/assets/1")
+    response = client.get("/api/v1/assets/1", headers={"Cache-Control": "no-cache"})
+    assert reads == [False, True]
+    assert response.headers["ETag"] == '"5"'
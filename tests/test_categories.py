@@ -0,0 +1,163 @@
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import compro_category
+from app.core import single_flight
+from app.core.cache import ContentCache
+from app.core.config import settings
+from app.repositories.compro_category_repository import ComproCategoryRepository
+
+Row = namedtuple("Row", "cc_id cc_name ca_id ca_title ca_image ca_link ca_subtitle asset_count")
+
+
+def asset_row(cc_id, cc_name, ca_id, asset_count):
+    return Row(cc_id, cc_name, ca_id, f"Asset {ca_id}", f"/{ca_id}.png", None, None, asset_count)
+
+
+def empty_row(cc_id, cc_name):
+    # Outer join without a match: all asset columns NULL
+    return Row(cc_id, cc_name, None, None, None, None, None, None)
+
+
+class FakeResult:
+    _attributes = {}
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class CapturingSession(Session):
+    """Returns canned rows (already in SQL order) and keeps the statement"""
+
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+        self.statement = None
+
+    def execute(self, statement, *args, **kwargs):
+        self.statement = statement
+        return FakeResult(self.rows)
+
+
+def test_groups_rows_per_category_in_sql_order():
+    db = CapturingSession([
+        asset_row(2, "Apps", 10, 3),
+        asset_row(2, "Apps", 11, 3),
+        empty_row(5, "Empty"),
+        asset_row(1, "Web", 7, 1),
+        asset_row(4, "Web", 8, 1),
+    ])
+    categories = ComproCategoryRepository().get_all_with_assets(db, per_category=2)
+
+    assert [(c["cc_id"], c["cc_name"], c["asset_count"]) for c in categories] == [
+        (2, "Apps", 3),
+        (5, "Empty", 0),
+        (1, "Web", 1),
+        (4, "Web", 1),
+    ]
+    assert [a["ca_id"] for a in categories[0]["assets"]] == [10, 11]
+    assert categories[1]["assets"] == []
+    # Same name, different IDs: not merged
+    assert [a["ca_id"] for a in categories[2]["assets"]] == [7]
+    assert [a["ca_id"] for a in categories[3]["assets"]] == [8]
+    assert categories[0]["assets"][0] == {
+        "ca_id": 10,
+        "ca_title": "Asset 10",
+        "ca_image": "/10.png",
+        "ca_link": None,
+        "ca_subtitle": None,
+        "cc_id": 2,
+        "cc_name": "Apps",
+    }
+
+
+def test_no_categories():
+    assert ComproCategoryRepository().get_all_with_assets(CapturingSession([]), per_category=5) == []
+
+
+def test_single_statement_with_window_functions():
+    db = CapturingSession([])
+    ComproCategoryRepository().get_all_with_assets(db, per_category=3)
+    sql = " ".join(
+        str(db.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})).split()
+    )
+
+    assert "row_number() OVER (PARTITION BY compro.compro_assets.ca_cc_id ORDER BY compro.compro_assets.ca_id) AS rn" in sql
+    assert "count(*) OVER (PARTITION BY compro.compro_assets.ca_cc_id) AS asset_count" in sql
+    assert "FROM compro.compro_category LEFT OUTER JOIN" in sql
+    assert "ON anon_1.ca_cc_id = compro.compro_category.cc_id AND anon_1.rn <= 3" in sql
+    assert sql.endswith(
+        "ORDER BY compro.compro_category.cc_name, compro.compro_category.cc_id, anon_1.rn"
+    )
+
+
+class FakeRepository:
+    def get_all(self, db):
+        return [SimpleNamespace(cc_id=1, cc_name="Apps"), SimpleNamespace(cc_id=2, cc_name="Empty")]
+
+    def get_all_with_assets(self, db, per_category):
+        self.per_category = per_category
+        return [
+            {
+                "cc_id": 1,
+                "cc_name": "Apps",
+                "asset_count": 7,
+                "assets": [{"ca_id": 10, "ca_title": "Asset 10", "ca_image": None, "ca_link": None,
+                            "ca_subtitle": None, "cc_id": 1, "cc_name": "Apps"}],
+            },
+            {"cc_id": 2, "cc_name": "Empty", "asset_count": 0, "assets": []},
+        ]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.main import app
+
+    repository = FakeRepository()
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(settings, "DB_ADMISSION_ENABLED", False)
+    monkeypatch.setattr(single_flight, "content_cache", ContentCache())
+    monkeypatch.setattr(single_flight, "run_with_session", lambda func, *args: func(None, *args))
+    monkeypatch.setattr(compro_category.service, "repository", repository)
+    client = TestClient(app)
+    client.repository = repository
+    return client
+
+
+def test_plain_categories_keep_original_shape(client):
+    response = client.get("/api/v1/categories")
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"cc_id": 1, "cc_name": "Apps"}, {"cc_id": 2, "cc_name": "Empty"}]
+
+
+def test_include_assets_returns_counts_and_assets(client):
+    response = client.get("/api/v1/categories", params={"include": "assets", "per_category": 3})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert client.repository.per_category == 3
+    assert data[0]["asset_count"] == 7
+    assert data[0]["assets"] == [{
+        "ca_id": 10, "ca_title": "Asset 10", "ca_image": None, "ca_subtitle": None,
+        "ca_link": None, "cc_id": 1, "cc_name": "Apps",
+    }]
+    assert data[1] == {"cc_id": 2, "cc_name": "Empty", "asset_count": 0, "assets": []}
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"include": "assets", "per_category": 0},
+        {"include": "assets", "per_category": 51},
+        {"include": "everything"},
+    ],
+)
+def test_invalid_include_parameters_are_422(client, params):
+    assert client.get("/api/v1/categories", params=params).status_code == 422
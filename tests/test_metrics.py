@@ -0,0 +1,16 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.rate_limit import EXEMPT_PATHS
+
+
+def test_metrics_requires_authentication(monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 401
+
+
+def test_metrics_is_rate_limited():
+    assert "/metrics" not in EXEMPT_PATHS
@@ -0,0 +1,168 @@
+import sys
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1.endpoints import admin
+from app.core.config import settings
+from app.core.profiler import TRUNCATED, ProfilerBusy, SamplingProfiler
+
+
+def make_profiler(**overrides):
+    options = dict(max_seconds=5, min_interval_ms=1, max_overhead=0.5, max_depth=128)
+    options.update(overrides)
+    return SamplingProfiler(**options)
+
+
+def app_function(name: str, body: str):
+    """Define a function whose frames look like they belong to the app package"""
+    namespace = {"__name__": "app.fake"}
+    exec(f"def {name}(callback):\n    {body}\n", namespace)
+    return namespace[name]
+
+
+def test_collapse_keeps_only_app_stacks_when_app_only():
+    profiler = make_profiler()
+    handler = app_function("handler", "return callback()")
+
+    def probe():
+        frame = sys._getframe()
+        return profiler._collapse(frame, True), profiler._collapse(frame, False)
+
+    app_only, everything = handler(probe)
+    assert app_only == everything
+    labels = app_only.split(";")
+    assert labels[-1] == f"{__name__}:probe"
+    assert labels[-2] == "app.fake:handler"
+
+    frame = sys._getframe()
+    assert profiler._collapse(frame, True) is None
+    assert profiler._collapse(frame, False).endswith(f"{__name__}:test_collapse_keeps_only_app_stacks_when_app_only")
+
+
+def test_collapse_marks_stacks_cut_by_max_depth():
+    profiler = make_profiler(max_depth=5)
+
+    def recurse(depth):
+        if depth == 0:
+            return profiler._collapse(sys._getframe(), False)
+        return recurse(depth - 1)
+
+    labels = recurse(20).split(";")
+    assert labels[0] == TRUNCATED
+    assert labels[1:] == [f"{__name__}:recurse"] * 5
+
+
+def test_shallow_stack_is_not_marked_truncated():
+    profiler = make_profiler(max_depth=10_000)
+    assert TRUNCATED not in profiler._collapse(sys._getframe(), False)
+
+
+def test_interval_is_stretched_to_stay_within_overhead_budget():
+    profiler = make_profiler(max_overhead=1e-6)
+    started = time.perf_counter()
+    result = profiler.run(seconds=0.2, interval_ms=1, app_only=False)
+
+    # One sample costs far more than 1e-6 of a 1 ms interval, so the interval grows
+    assert result.interval > 0.001
+    assert result.samples < 5
+    # The stretched interval never sleeps past the deadline
+    assert time.perf_counter() - started < 1
+
+
+def test_interval_is_floored_at_min_interval():
+    result = make_profiler(min_interval_ms=50).run(seconds=0.1, interval_ms=1, app_only=False)
+    assert result.interval >= 0.05
+    assert result.samples <= 3
+
+
+def test_seconds_are_capped_at_max_seconds():
+    result = make_profiler(max_seconds=0.1).run(seconds=30, interval_ms=10, app_only=False)
+    assert result.duration < 1
+
+
+def test_sampling_excludes_own_thread_and_prefixes_thread_name():
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name="busy-worker")
+    worker.start()
+    try:
+        result = make_profiler().run(seconds=0.05, interval_ms=5, app_only=False)
+    finally:
+        stop.set()
+        worker.join()
+
+    stacks = result.collapsed().splitlines()
+    assert any(line.startswith("busy-worker;") for line in stacks)
+    assert not any("app.core.profiler:_sample" in line for line in stacks)
+
+
+def test_concurrent_run_is_rejected():
+    profiler = make_profiler()
+    first = threading.Thread(target=profiler.run, args=(0.3, 10, False))
+    first.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(ProfilerBusy):
+            profiler.run(0.1, 10, False)
+    finally:
+        first.join()
+    # The lock is released afterwards
+    profiler.run(0.01, 10, False)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def admin_client(client):
+    app = client.app
+    app.dependency_overrides[deps.require_auth] = lambda: {"username": "admin"}
+    for route in admin.router.routes:
+        for dependency in route.dependencies:
+            app.dependency_overrides[dependency.dependency] = lambda: None
+    return client
+
+
+def test_profile_requires_authentication(client):
+    assert client.get("/api/v1/admin/profile").status_code == 401
+
+
+def test_profile_disabled_is_404(admin_client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", False)
+    assert admin_client.get("/api/v1/admin/profile", params={"seconds": 1}).status_code == 404
+
+
+def test_profile_while_busy_is_409(admin_client, monkeypatch):
+    profiler = make_profiler()
+    monkeypatch.setattr(admin, "profiler", profiler)
+    profiler._lock.acquire()
+    try:
+        response = admin_client.get("/api/v1/admin/profile", params={"seconds": 1})
+    finally:
+        profiler._lock.release()
+    assert response.status_code == 409
+
+
+def test_profile_seconds_above_cap_is_422(admin_client):
+    response = admin_client.get("/api/v1/admin/profile", params={"seconds": settings.PROFILER_MAX_SECONDS + 1})
+    assert response.status_code == 422
+
+
+def test_profile_returns_collapsed_stacks(admin_client, monkeypatch):
+    monkeypatch.setattr(admin, "profiler", make_profiler(max_seconds=0.1))
+    response = admin_client.get("/api/v1/admin/profile", params={"seconds": 1, "app_only": False})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    for line in response.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
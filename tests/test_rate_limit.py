@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.rate_limit import MemoryBackend, RateLimitMiddleware, get_client_key, retry_after_seconds
+
+WINDOW = 60
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def hit(backend: MemoryBackend, key: str = "k", limit: int = 10):
+    return asyncio.run(backend.hit(key, limit, WINDOW))
+
+
+def test_retry_after_rolls_into_next_window_when_current_is_full():
+    # 45s left in this window, then 10 in "previous" still weighs 10 * (1 - 6/60) = 9
+    assert retry_after_seconds(previous=0, current=10, elapsed=15, window=WINDOW, limit=10) == 51
+
+
+def test_retry_after_waits_for_previous_window_to_decay():
+    # 10 * (1 - 36/60) + 5 = 9, so one more request fits at elapsed 36
+    assert retry_after_seconds(previous=10, current=5, elapsed=30, window=WINDOW, limit=10) == 6
+
+
+def test_retry_after_is_at_least_one_second():
+    assert retry_after_seconds(previous=10, current=5, elapsed=35.9, window=WINDOW, limit=10) == 1
+
+
+def test_retry_after_accounts_for_full_window_becoming_previous():
+    # Next window starts in 0.1s, but the 1 request there weighs 1 until it fully decays
+    assert retry_after_seconds(previous=0, current=1, elapsed=59.9, window=WINDOW, limit=1) == 61
+
+
+def test_memory_backend_allows_up_to_limit():
+    backend = MemoryBackend(clock=FakeClock(0))
+    remaining = [hit(backend)[1] for _ in range(10)]
+    assert remaining == [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    assert hit(backend) == (False, 0, 66)
+
+
+def test_memory_backend_sliding_estimate_uses_previous_window():
+    clock = FakeClock(0)
+    backend = MemoryBackend(clock=clock)
+    for _ in range(10):
+        hit(backend)
+
+    # Halfway through the next window the previous 10 count as 5
+    clock.now = 90
+    results = [hit(backend) for _ in range(6)]
+    assert [allowed for allowed, _, _ in results] == [True] * 5 + [False]
+    assert results[0][1] == 4
+    assert results[-1] == (False, 0, 6)
+
+    # Rejected requests do not consume quota
+    assert backend.counters["k"].current == 5
+
+
+def test_memory_backend_forgets_windows_older_than_previous():
+    clock = FakeClock(0)
+    backend = MemoryBackend(clock=clock)
+    for _ in range(10):
+        hit(backend)
+
+    clock.now = 3 * WINDOW + 30
+    assert hit(backend) == (True, 9, 0)
+
+
+def test_memory_backend_evicts_idle_keys():
+    clock = FakeClock(0)
+    backend = MemoryBackend(clock=clock)
+    hit(backend, "idle")
+    clock.now = 2 * WINDOW + 1
+    hit(backend, "active")
+    assert list(backend.counters) == ["active"]
+
+
+def test_memory_backend_bounds_keys_by_lru():
+    backend = MemoryBackend(max_keys=2, clock=FakeClock(0))
+    hit(backend, "a")
+    hit(backend, "b")
+    hit(backend, "a")
+    hit(backend, "c")
+    assert list(backend.counters) == ["a", "c"]
+
+
+def make_request(headers=None, client=("10.0.0.1", 1234)) -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw, "client": client})
+
+
+def test_client_key_ignores_tokens(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+    assert get_client_key(make_request({"Authorization": "Bearer a"})) == "ip:10.0.0.1"
+    assert get_client_key(make_request({"Cookie": "ATLASTOKEN=b"})) == "ip:10.0.0.1"
+
+
+def test_client_key_ignores_forwarded_for_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+    assert get_client_key(make_request({"X-Forwarded-For": "1.2.3.4"})) == "ip:10.0.0.1"
+
+
+@pytest.mark.parametrize(
+    "hops, forwarded, expected",
+    [
+        (1, "6.6.6.6, 1.2.3.4", "ip:1.2.3.4"),
+        (2, "6.6.6.6, 1.2.3.4, 172.16.0.2", "ip:1.2.3.4"),
+        (2, "1.2.3.4", "ip:10.0.0.1"),
+    ],
+)
+def test_client_key_uses_entry_from_outermost_trusted_proxy(monkeypatch, hops, forwarded, expected):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", hops)
+    assert get_client_key(make_request({"X-Forwarded-For": forwarded})) == expected
+
+
+@pytest.fixture
+def limited_client(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_REQUESTS", 5)
+    monkeypatch.setattr(settings, "RATE_LIMIT_WRITE_REQUESTS", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_WINDOW", WINDOW)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+
+    app = FastAPI()
+
+    @app.get("/items")
+    async def read_items():
+        return {"ok": True}
+
+    @app.post("/items")
+    async def write_item():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, backend=MemoryBackend(clock=FakeClock(30)))
+    return TestClient(app)
+
+
+def test_middleware_limits_writes_separately_from_reads(limited_client):
+    for token in ("rand0", "rand1"):
+        response = limited_client.post("/items", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+
+    response = limited_client.post("/items", headers={"Authorization": "Bearer rand2"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+    assert response.json()["success"] is False
+
+    response = limited_client.get("/items")
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "5"
+    assert response.headers["X-RateLimit-Remaining"] == "4"
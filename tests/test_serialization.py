@@ -0,0 +1,98 @@
+import warnings
+from datetime import datetime
+from typing import List
+
+import pytest
+
+from app.core.config import settings
+from app.core.serialization import render, render_trusted, render_validated
+from app.schemas.common import DataResponse
+from app.schemas.compro_asset import ComproAsset, ComproAssetBatchItem, ComproAssetList
+from app.schemas.compro_category import ComproCategory, ComproCategoryWithAssets
+
+DETAIL = dict(
+    ca_id=1,
+    ca_title="Résumé — “quoted” 日本",
+    ca_tagline=None,
+    ca_image="/1.png",
+    ca_image_carousel=["/a.png", "/b.png"],
+    ca_subtitle="Subtitle",
+    ca_link="https://example.com/?q=1&r=2",
+    ca_cc_id=2,
+    cc_id=2,
+    cc_name="Apps",
+    created_at=datetime(2024, 1, 2, 3, 4, 5, 678901),
+    created_by="admin",
+    updated_at=None,
+    updated_by=None,
+    ca_version=3,
+)
+LIST_ROW = dict(ca_id=1, ca_title="Ünïcode", ca_image=None, ca_subtitle="S", ca_link=None, cc_id=2, cc_name="Apps")
+
+
+def payloads():
+    detail = ComproAsset(**DETAIL)
+    return [
+        (DataResponse[List[ComproAssetList]], [ComproAssetList(**LIST_ROW), ComproAssetList(ca_id=2)]),
+        (DataResponse[List[ComproAssetList]], []),
+        (DataResponse[ComproAsset], detail),
+        (
+            DataResponse[List[ComproAssetBatchItem]],
+            [
+                ComproAssetBatchItem(ca_id=1, found=True, data=detail),
+                ComproAssetBatchItem(ca_id=9, found=False, data=None),
+            ],
+        ),
+        (DataResponse[List[ComproCategory]], [ComproCategory(cc_id=1, cc_name="Apps")]),
+        (
+            DataResponse[List[ComproCategoryWithAssets]],
+            [
+                ComproCategoryWithAssets(cc_id=2, cc_name="Apps", asset_count=7, assets=[ComproAssetList(**LIST_ROW)]),
+                ComproCategoryWithAssets(cc_id=3, cc_name="Empty", asset_count=0, assets=[]),
+            ],
+        ),
+        (DataResponse[None], None),
+    ]
+
+
+@pytest.mark.parametrize("response_model, data", payloads())
+def test_trusted_output_matches_validated(response_model, data):
+    payload = response_model.model_construct(success=True, message="ok", data=data)
+    assert render_trusted(payload) == render_validated(response_model, payload)
+
+
+def test_check_mode_passes_matching_output(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_SERIALIZATION", True)
+    monkeypatch.setattr(settings, "TRUSTED_SERIALIZATION_CHECK", True)
+    model = DataResponse[ComproAsset]
+    payload = model.model_construct(success=True, message="ok", data=ComproAsset(**DETAIL))
+
+    response = render(model, payload, 201)
+    assert response.status_code == 201
+    assert response.body == render_validated(model, payload)
+
+
+def unvalidated_payload():
+    # model_construct skips coercion: the trusted path writes "5", validation writes 5
+    model = DataResponse[List[ComproAssetList]]
+    return model, model.model_construct(success=True, message="ok", data=[ComproAssetList.model_construct(ca_id="5")])
+
+
+def test_check_mode_raises_on_mismatch(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_SERIALIZATION", True)
+    monkeypatch.setattr(settings, "TRUSTED_SERIALIZATION_CHECK", True)
+    model, payload = unvalidated_payload()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with pytest.raises(AssertionError, match="Trusted serialization mismatch"):
+            render(model, payload)
+
+
+def test_disabled_trusted_serialization_uses_validating_path(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_SERIALIZATION", False)
+    model, payload = unvalidated_payload()
+
+    response = render(model, payload)
+    assert response.body == render_validated(model, payload)
+    assert b'"ca_id":5' in response.body
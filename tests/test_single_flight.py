@@ -0,0 +1,215 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core import single_flight
+from app.core.cache import ContentCache
+from app.core.config import settings
+from app.core.single_flight import SingleFlight, cached_read
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_identical_calls_run_once():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await release.wait()
+            return ["row"]
+
+        callers = [asyncio.ensure_future(flight.do("k", load)) for _ in range(5)]
+        await settle()
+        assert flight.stats() == {"in_flight": 1, "executed": 1, "queries_saved": 4}
+
+        release.set()
+        results = await asyncio.gather(*callers)
+        assert results == [["row"]] * 5
+        assert len(calls) == 1
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_different_keys_do_not_share():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0)
+            return object()
+
+        first, second = await asyncio.gather(flight.do("a", load), flight.do("b", load))
+        assert first is not second
+        assert flight.stats()["executed"] == 2
+        assert flight.stats()["queries_saved"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_exception_is_shared_and_key_is_released():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flight.do("k", load) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(calls) == 1
+        assert flight.stats()["in_flight"] == 0
+
+        # The next call starts a fresh attempt
+        with pytest.raises(ValueError):
+            await flight.do("k", load)
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", load))
+        second = asyncio.ensure_future(flight.do("k", load))
+        await settle()
+
+        first.cancel()
+        await settle()
+        release.set()
+        assert await second == "done"
+        assert first.cancelled()
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Fresh cache and flight; service reads get db=None instead of a real session"""
+    cache = ContentCache(ttl=30, stale_ttl=300)
+    flight = SingleFlight()
+    monkeypatch.setattr(settings, "DB_ADMISSION_ENABLED", False)
+    monkeypatch.setattr(single_flight, "content_cache", cache)
+    monkeypatch.setattr(single_flight, "read_flight", flight)
+    monkeypatch.setattr(single_flight, "run_with_session", lambda func, *args: func(None, *args))
+    return cache, flight
+
+
+def test_cached_read_coalesces_and_caches(isolated):
+    cache, flight = isolated
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def read(db, ca_id):
+        calls.append(ca_id)
+        started.set()
+        release.wait(5)
+        return {"ca_id": ca_id}
+
+    async def scenario():
+        callers = [asyncio.ensure_future(cached_read(("asset", 1), read, 1)) for _ in range(3)]
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        release.set()
+        results = await asyncio.gather(*callers)
+        assert results == [{"ca_id": 1}] * 3
+
+        # Served from cache without another flight
+        assert await cached_read(("asset", 1), read, 1) == {"ca_id": 1}
+
+    asyncio.run(scenario())
+    assert calls == [1]
+    assert flight.stats()["queries_saved"] == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_read_after_write_does_not_join_older_flight(isolated):
+    cache, flight = isolated
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def read(db):
+        calls.append(cache.version)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            return "before write"
+        return "after write"
+
+    async def scenario():
+        before = asyncio.ensure_future(cached_read(("assets",), read))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+
+        cache.bump()
+        after = await cached_read(("assets",), read)
+        release.set()
+        assert await before == "before write"
+        assert after == "after write"
+
+        # The older read was tagged with the old version, so it never masks the newer one
+        assert await cached_read(("assets",), read) == "after write"
+
+    asyncio.run(scenario())
+    assert calls == [0, 1]
+    assert flight.stats()["executed"] == 2
+    assert flight.stats()["queries_saved"] == 0
+
+
+def test_fresh_read_skips_lookup_but_refreshes_entry(isolated):
+    cache, flight = isolated
+    cache.set(("asset", 1), "cached")
+    calls = []
+
+    def read(db):
+        calls.append(1)
+        return "from db"
+
+    async def scenario():
+        assert await cached_read(("asset", 1), read, fresh=True) == "from db"
+        assert await cached_read(("asset", 1), read) == "from db"
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+
+
+def test_normal_read_joining_fresh_flight_leaves_result_cached(isolated):
+    cache, flight = isolated
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def read(db):
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "from db"
+
+    async def scenario():
+        fresh = asyncio.ensure_future(cached_read(("asset", 1), read, fresh=True))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        joined = asyncio.ensure_future(cached_read(("asset", 1), read))
+        await settle()
+        release.set()
+        assert await fresh == await joined == "from db"
+        assert await cached_read(("asset", 1), read) == "from db"
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+    assert flight.stats()["queries_saved"] == 1